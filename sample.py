@@ -13,8 +13,9 @@ import time
 from thor import Thor, Request, JSONResponse, Router
 from thor.middleware import CORSMiddleware, RequestLoggingMiddleware
 from thor.auth import AuthMiddleware, JWTAuthBackend, User, login_required
-from thor.session import SessionMiddleware
-from thor.cookies import SecureCookie
+from thor.session import Session, SessionMiddleware
+from thor.cookies import CookieOptions, SecureCookie
+from thor.exceptions import BadRequest
 
 # =============================================================================
 # Application Setup
@@ -90,12 +91,13 @@ async def login(request: Request) -> JSONResponse:
     # In a real application, you would verify credentials against a database and hash passwords
     # Or OAuth2 provider, LDAP, etc. This is just a demonstration.
     if username == "admin" and password == "password":
+        now: int = int(time.time())               # wall clock, as JWT claims require
         payload: dict[str, int | str | list[str]] = {
             "sub": "1",                           # user ID or subject, attribute based on registered JWT claims
             "username": username,
             "scopes": ["read"],                   # custom claim for user permissions
-            "iat": int(time.time()),              # issued at (registered JWT claims)
-            "exp": int(time.time()) + 3600,       # expires in 1 hour (registered JWT claims)
+            "iat": now,                           # issued at (registered JWT claims)
+            "exp": now + 3600,                    # expires in 1 hour (registered JWT claims)
         }
         token: str = jwt.encode(payload, app.secret_key, algorithm="HS256")
         return JSONResponse({"token": token})
@@ -110,18 +112,16 @@ async def protected(request: Request) -> dict:
     return {"user": user.username}
 
 
-@app.get("/")
-async def hello_world(request: Request) -> dict:
-    """
-    Hello World endpoint.
-
-    Returns a JSON greeting message.
-    """
-    return {
+# Hello World endpoint — constant content, so it is encoded once at
+# startup and served from cached bytes on every request.
+app.static(
+    "/",
+    {
         "message": "Hello, World! Welcome to Thor ⚡",
         "framework": "Thor",
         "version": app.version,
-    }
+    },
+)
 
 
 @app.get("/health")
@@ -191,8 +191,8 @@ async def search(request: Request) -> dict:
     Demonstrates query parameter handling.
     """
     query = request.get_query("q", "")
-    page = int(request.get_query("page", "1") or "1")
-    limit = int(request.get_query("limit", "10") or "10")
+    page = request.get_query_int("page", 1)
+    limit = request.get_query_int("limit", 10)
 
     return {
         "query": query,
@@ -214,9 +214,9 @@ async def get_session(request: Request) -> dict:
 
     Demonstrates session handling.
     """
-    session = request._scope.get("session", {})
+    session: Session = request._scope["session"]
     return {
-        "session_data": dict(session),
+        "session_data": session.as_mapping(),
         "visit_count": session.get("visits", 0),
     }
 
@@ -228,19 +228,18 @@ async def update_session(request: Request) -> dict:
 
     Demonstrates session modification.
     """
-    session = request._scope.get("session", {})
+    session: Session = request._scope["session"]
     data = await request.json()
 
     # Update session with provided data
-    for key, value in data.items():
-        session[key] = value
+    session.update(data)
 
     # Track visits
     session["visits"] = session.get("visits", 0) + 1
 
     return {
         "message": "Session updated",
-        "session_data": dict(session),
+        "session_data": session.as_mapping(),
     }
 
 
@@ -251,8 +250,6 @@ async def cookie_demo(request: Request) -> JSONResponse:
 
     Sets a secure cookie in the response.
     """
-    from thor.cookies import CookieOptions
-
     response = JSONResponse(
         {
             "message": "Cookie set!",
@@ -283,8 +280,6 @@ async def cookie_demo(request: Request) -> JSONResponse:
 @app.get("/error")
 async def trigger_error(request: Request) -> dict:
     """Demonstrates error handling."""
-    from thor.exceptions import BadRequest
-
     raise BadRequest("This is a demonstration error")
 
 
@@ -295,13 +290,15 @@ async def trigger_error(request: Request) -> dict:
 api_v1 = Router(prefix="/api/v1")
 
 
-@api_v1.get("/info")
-async def api_info(request: Request) -> dict:
-    """API version information."""
-    return {
+# API version information (constant, pre-encoded); static routes are
+# registered on the app, so the prefix is spelled out here
+app.static(
+    "/api/v1/info",
+    {
         "api_version": "0.1.0",
         "framework": "Thor",
-    }
+    },
+)
 
 
 @api_v1.get("/products")
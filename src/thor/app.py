@@ -3,6 +3,7 @@ Main Thor application class.
 The central component that ties all framework features together.
 """
 
+import importlib.util
 from collections.abc import Callable
 from typing import Any
 
@@ -10,9 +11,10 @@ from thor.exceptions import HTTPException
 from thor.lifespan import Lifespan, LifespanProtocolHandler
 from thor.middleware import ErrorHandlerMiddleware, Middleware, MiddlewareStack
 from thor.request import Request
-from thor.response import JSONResponse, Response
+from thor.response import JSONResponse, Response, StaticResponse, TextResponse
 from thor.routing import Route, Router
 from thor.types import ASGIApp, Receive, RouteHandler, Scope, Send
+from thor.websocket import WebSocket
 
 # Minimum recommended secret key length (in characters)
 _MIN_SECRET_KEY_LENGTH: int = 16
@@ -24,6 +26,20 @@ _SECRET_REQUIRED_MIDDLEWARE: set[str] = {
 }
 
 
+def _no_content(_: None) -> Response:
+    """Convert a ``None`` handler result into an empty 204 response."""
+    return TextResponse("", status_code=204)
+
+
+# Handler return types converted to a Response, keyed by exact type
+_RESPONSE_COERCERS: dict[type, Callable[[Any], Response]] = {
+    dict: JSONResponse,
+    list: JSONResponse,
+    str: TextResponse,
+    type(None): _no_content,
+}
+
+
 class Thor:
     """
     The Thor micro web framework application.
@@ -76,6 +92,14 @@ class Thor:
         
         # Build flag
         self._app: ASGIApp | None = None
+        
+        # scope["type"] -> ASGI callable. "http" points at the built
+        # middleware chain once finalize() has run.
+        self._dispatchers: dict[str, ASGIApp] = {
+            "http": self._finalize_and_dispatch,
+            "websocket": self._handle_websocket,
+            "lifespan": self._handle_lifespan,
+        }
     
     # -------------------------------------------------------------------------
     # ASGI Interface
@@ -84,21 +108,63 @@ class Thor:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """ASGI application entry point."""
         scope["app"] = self
-        
-        if scope["type"] == "lifespan":
-            handler = LifespanProtocolHandler(self._get_app(), self._lifespan)
-            await handler(scope, receive, send)
-        elif scope["type"] == "websocket":
-            await self._handle_websocket(scope, receive, send)
-        else:
-            await self._get_app()(scope, receive, send)
+        handler = self._dispatchers.get(scope["type"])
+        if handler is None:
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']!r}")
+        await handler(scope, receive, send)
+    
+    async def _finalize_and_dispatch(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """First HTTP request: build the chain, which then replaces this entry."""
+        await self.finalize()(scope, receive, send)
+    
+    async def _handle_lifespan(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Build the chain and run the lifespan protocol."""
+        try:
+            app = self.finalize()
+        except RuntimeError as exc:
+            # Misconfiguration: refuse to start rather than fail per request
+            await receive()  # lifespan.startup
+            await send({"type": "lifespan.startup.failed", "message": str(exc)})
+            return
+        handler = LifespanProtocolHandler(app, self._lifespan)
+        await handler(scope, receive, send)
     
-    def _get_app(self) -> ASGIApp:
-        """Get the built ASGI application with middleware."""
+    def finalize(self) -> ASGIApp:
+        """
+        Build and cache the middleware chain.
+        
+        Called automatically on the first request (or on lifespan
+        startup). Safe to call repeatedly; the chain is only rebuilt
+        after ``add_middleware`` invalidates it.
+        
+        Raises:
+            RuntimeError: If any security middleware was added without
+                          a secret_key configured on the application.
+        """
         if self._app is None:
-            self._app = self._middleware_stack.build()
+            self._validate_middleware()
+            # Only "http" scopes are dispatched to the chain
+            self._app = self._middleware_stack.build(http_only=True)
+            self._dispatchers["http"] = self._app
         return self._app
     
+    def _validate_middleware(self) -> None:
+        """Check all registered middleware against the app configuration."""
+        if self.secret_key is not None:
+            return
+        offending = [
+            name
+            for name in (
+                getattr(cls, "__name__", "") for cls in self._middleware_stack.middleware_classes
+            )
+            if name in _SECRET_REQUIRED_MIDDLEWARE
+        ]
+        if offending:
+            raise RuntimeError(
+                f"{', '.join(offending)} require(s) a secret_key. "
+                f"Pass secret_key= when creating your Thor() application."
+            )
+    
     async def _handle_request(
         self,
         scope: Scope,
@@ -117,21 +183,23 @@ class Thor:
         # Call the route handler
         response = await route.handler(request, **path_params)
         
-        # Convert response if needed
-        if not isinstance(response, Response):
-            if isinstance(response, dict) or isinstance(response, list):
-                response = JSONResponse(response)
-            elif isinstance(response, str):
-                from thor.response import TextResponse
+        # Convert response if needed — exact-type lookup first, then
+        # isinstance checks only for subclasses and other values
+        coerce = _RESPONSE_COERCERS.get(type(response))
+        if coerce is not None:
+            response = coerce(response)
+        elif not isinstance(response, Response):
+            if isinstance(response, str):
                 response = TextResponse(response)
-            elif response is None:
-                from thor.response import TextResponse
-                response = TextResponse("", status_code=204)
             else:
                 response = JSONResponse(response)
         
-        # Send the response
-        await response(send)
+        # Send the response; only responses that use server extensions
+        # (pathsend for files) take the scope
+        if response.needs_scope:
+            await response(send, scope)
+        else:
+            await response(send)
     
     # -------------------------------------------------------------------------
     # Routing
@@ -205,6 +273,42 @@ class Thor:
         """Decorator for routes with custom methods."""
         return self._router.route(path, methods, name)
     
+    def static(
+        self,
+        path: str,
+        content: Any,
+        status_code: int = 200,
+        media_type: str | None = None,
+        name: str | None = None,
+    ) -> Route:
+        """
+        Register a GET route that always returns the same content.
+        
+        *content* is encoded once here and every request is served from
+        the cached bytes. ``bytes`` and ``str`` are sent as-is (default
+        media types ``application/octet-stream`` and ``text/plain``);
+        anything else is serialized as JSON.
+        """
+        if isinstance(content, bytes):
+            body = content
+            default_media_type = "application/octet-stream"
+        elif isinstance(content, str):
+            body = content.encode("utf-8")
+            default_media_type = "text/plain"
+        else:
+            body = JSONResponse(content).render()
+            default_media_type = JSONResponse.media_type
+        response = StaticResponse(
+            body,
+            status_code=status_code,
+            media_type=media_type or default_media_type,
+        )
+        
+        async def handler(request: Request) -> StaticResponse:
+            return response
+        
+        return self._router.add_route(path, handler, methods=["GET"], name=name)
+    
     def websocket(
         self,
         path: str,
@@ -220,8 +324,6 @@ class Thor:
         send: Send,
     ) -> None:
         """Dispatch an incoming WebSocket connection."""
-        from thor.websocket import WebSocket
-
         path = scope.get("path", "/")
         try:
             route, path_params = self._router.ws_match(path)
@@ -246,18 +348,13 @@ class Thor:
         """
         Add middleware to the application.
         
-        Raises:
-            RuntimeError: If a security middleware is added without
-                          a secret_key configured on the application.
+        Registration only records the middleware; configuration is
+        validated once, when the chain is built by :meth:`finalize`.
         """
-        class_name = getattr(middleware_class, "__name__", "")
-        if class_name in _SECRET_REQUIRED_MIDDLEWARE and self.secret_key is None:
-            raise RuntimeError(
-                f"{class_name} requires a secret_key. "
-                f"Pass secret_key= when creating your Thor() application."
-            )
         self._middleware_stack.add(middleware_class, **options)
-        self._app = None  # Reset built app
+        # Reset built app
+        self._app = None
+        self._dispatchers["http"] = self._finalize_and_dispatch
     
     # -------------------------------------------------------------------------
     # Lifespan
@@ -286,17 +383,10 @@ class Thor:
         Returns:
             The generated URL path.
         """
-        for route in self.routes:
-            if route.name == name:
-                path = route.path
-                for param, value in path_params.items():
-                    # Replace {param} or {param:type} patterns
-                    import re
-                    pattern = rf"\{{{param}(?::\w+)?\}}"
-                    path = re.sub(pattern, str(value), path)
-                return path
-        
-        raise ValueError(f"No route named '{name}'")
+        route = self._router.get_route(name)
+        if route is None:
+            raise ValueError(f"No route named '{name}'")
+        return route.build_path(**path_params)
     
     def run(
         self,
@@ -305,6 +395,8 @@ class Thor:
         reload: bool = False,
         workers: int = 1,
         log_level: str = "info",
+        loop: str | None = None,
+        http: str | None = None,
     ) -> None:
         """
         Run the application using uvicorn.
@@ -315,6 +407,10 @@ class Thor:
             reload: Enable auto-reload.
             workers: Number of worker processes.
             log_level: Logging level.
+            loop: Event loop implementation. Defaults to ``"uvloop"``
+                  when installed, otherwise ``"asyncio"``.
+            http: HTTP protocol implementation. Defaults to
+                  ``"httptools"`` when installed, otherwise ``"h11"``.
         """
         import uvicorn
         
@@ -325,4 +421,11 @@ class Thor:
             reload=reload,
             workers=workers,
             log_level=log_level,
+            loop=loop or _preferred_implementation("uvloop", "asyncio"),
+            http=http or _preferred_implementation("httptools", "h11"),
         )
+
+
+def _preferred_implementation(fast: str, fallback: str) -> str:
+    """Return *fast* if that module is importable, else *fallback*."""
+    return fast if importlib.util.find_spec(fast) is not None else fallback
@@ -2,19 +2,45 @@
 Authentication system for Thor framework.
 Provides pluggable authentication backends and user management.
 """
+import base64
+import functools
 import jwt
+import math
+import time
 
-from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Protocol
 
 from thor.exceptions import Forbidden, Unauthorized
 from thor.middleware import Middleware
 from thor.request import Request
 from thor.types import ASGIApp, Receive, Scope, Send
 
+# Maximum number of tokens remembered by JWTAuthBackend
+DEFAULT_JWT_CACHE_SIZE: int = 1024
 
-@dataclass
+
+def _credentials(auth_header: str | None, prefix: str, prefix_lower: str) -> str | None:
+    """
+    Return the credentials after *prefix* (``"<scheme> "``) in an
+    Authorization header.
+    
+    Headers spelling the scheme exactly as configured take a plain
+    ``startswith``; other casings fall back to lower-casing just the
+    prefix-length slice. Returns ``None`` when the header is missing,
+    uses another scheme, or carries no credentials.
+    """
+    if not auth_header:
+        return None
+    if not auth_header.startswith(prefix) and auth_header[:len(prefix)].lower() != prefix_lower:
+        return None
+    return auth_header[len(prefix):] or None
+
+
+@dataclass(slots=True)
 class User:
     """
     User representation for authentication.
@@ -40,17 +66,23 @@ class User:
         return scope in self.scopes
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AnonymousUser:
-    """Anonymous user for unauthenticated requests."""
+    """
+    Anonymous user for unauthenticated requests.
+    
+    Immutable and stateless, so backends and middleware share the
+    module-level ``_ANONYMOUS`` instance rather than allocating one
+    per request.
+    """
     
     id: str = ""
     username: str | None = None
     email: str | None = None
     is_authenticated: bool = False
     is_active: bool = False
-    scopes: list[str] = field(default_factory=list)
-    data: dict[str, Any] = field(default_factory=dict)
+    scopes: tuple[str, ...] = ()
+    data: Mapping[str, Any] = MappingProxyType({})
     
     @property
     def identity(self) -> None:
@@ -62,17 +94,22 @@ class AnonymousUser:
         return False
 
 
-class AuthBackend(ABC):
+# Shared instance returned for every unauthenticated request
+_ANONYMOUS = AnonymousUser()
+
+
+class AuthBackend(Protocol):
     """
-    Abstract authentication backend.
+    Authentication backend interface.
     
     Follows Dependency Inversion Principle - authentication middleware
     depends on this abstraction, not concrete implementations.
     
-    Implements the Strategy pattern for pluggable authentication.
+    Implements the Strategy pattern for pluggable authentication. A
+    structural Protocol: any object with a matching ``authenticate``
+    coroutine is a backend, no inheritance (or ABC machinery) needed.
     """
     
-    @abstractmethod
     async def authenticate(self, request: Request) -> User | AnonymousUser:
         """
         Authenticate a request and return a User or AnonymousUser.
@@ -86,7 +123,7 @@ class AuthBackend(ABC):
         ...
 
 
-class TokenAuthBackend(AuthBackend):
+class TokenAuthBackend:
     """
     Token-based authentication backend.
     Expects Authorization header with "Bearer <token>" format.
@@ -102,28 +139,24 @@ class TokenAuthBackend(AuthBackend):
         self._secret_key = secret_key
         self._verify_token = verify_token
         self._token_prefix = token_prefix
+        # "<scheme> " as configured and lower-cased, computed once
+        self._prefix = f"{token_prefix} "
+        self._prefix_lower = self._prefix.lower()
         self._algorithm = algorithm
     
     async def authenticate(self, request: Request) -> User | AnonymousUser:
-        auth_header = request.get_header("authorization")
-        
-        if not auth_header:
-            return AnonymousUser()
-        
-        try:
-            scheme, token = auth_header.split(" ", 1)
-        except ValueError:
-            return AnonymousUser()
-        
-        if scheme.lower() != self._token_prefix.lower():
-            return AnonymousUser()
+        token = _credentials(
+            request.get_header("authorization"), self._prefix, self._prefix_lower
+        )
+        if token is None:
+            return _ANONYMOUS
         
         if self._verify_token:
             user = await self._verify_token(token)
             if user:
                 return user
         
-        return AnonymousUser()
+        return _ANONYMOUS
 
     async def verify_token(self, token: str) -> User | None:
         try:
@@ -138,7 +171,7 @@ class TokenAuthBackend(AuthBackend):
             return None  # bad signature, malformed, etc.
 
 
-class SessionAuthBackend(AuthBackend):
+class SessionAuthBackend:
     """
     Session-based authentication backend.
     Retrieves user from session data.
@@ -156,60 +189,98 @@ class SessionAuthBackend(AuthBackend):
         session = request._scope.get("session")
         
         if not session:
-            return AnonymousUser()
+            return _ANONYMOUS
         
         user_id = session.get(self._session_key)
         if not user_id:
-            return AnonymousUser()
+            return _ANONYMOUS
         
         if self._load_user:
             user = await self._load_user(user_id)
             if user:
                 return user
         
-        return AnonymousUser()
+        return _ANONYMOUS
 
 
-class JWTAuthBackend(AuthBackend):
-    """JWT-based authentication backend."""
+class JWTAuthBackend:
+    """
+    JWT-based authentication backend.
+
+    Verified payloads are cached per raw token string until their
+    ``exp`` claim passes, so repeat requests carrying the same token
+    skip signature verification and JSON decoding. Tokens that fail
+    verification are not cached, so a flood of bogus tokens cannot
+    evict valid ones. The cache is bounded and evicts the least
+    recently used token first. Pass ``cache_size=0`` to disable it.
+    """
 
     def __init__(
         self,
         secret_key: str,
         algorithm: str = "HS256",
         token_prefix: str = "Bearer",
+        cache_size: int = DEFAULT_JWT_CACHE_SIZE,
     ) -> None:
         self._secret_key = secret_key
         self._algorithm = algorithm
         self._token_prefix = token_prefix
+        # "<scheme> " as configured and lower-cased, computed once
+        self._prefix = f"{token_prefix} "
+        self._prefix_lower = self._prefix.lower()
+        self._cache_size = cache_size
+        # token -> (verified payload, wall-clock expiry)
+        self._cache: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
 
     async def authenticate(self, request: Request) -> User | AnonymousUser:
-        auth_header: str | None = request.get_header("authorization")
-        if not auth_header:
-            return AnonymousUser()
+        token = _credentials(
+            request.get_header("authorization"), self._prefix, self._prefix_lower
+        )
+        if token is None:
+            return _ANONYMOUS
 
-        try:
-            scheme, token = auth_header.split(" ", 1)
-        except ValueError:
-            return AnonymousUser()
+        payload = self._decode(token)
+        if payload is None:
+            return _ANONYMOUS
+        return User(
+            id=payload["sub"],
+            username=payload.get("username"),
+            # Copy so handlers can't mutate the cached payload
+            scopes=list(payload.get("scopes", [])),
+        )
 
-        if scheme.lower() != self._token_prefix.lower():
-            return AnonymousUser()
+    def _decode(self, token: str) -> dict[str, Any] | None:
+        """Verify *token*, consulting the payload cache first."""
+        # Wall clock, to match the semantics of the JWT ``exp`` claim
+        now = time.time()
+        cached = self._cache.get(token)
+        if cached is not None:
+            payload, expires_at = cached
+            if expires_at > now:
+                self._cache.move_to_end(token)
+                return payload
+            del self._cache[token]
 
         try:
-            payload: dict[str, Any] = jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
-            return User(
-                id=payload["sub"],
-                username=payload.get("username"),
-                scopes=payload.get("scopes", []),
-            )
-        except jwt.ExpiredSignatureError:
-            return AnonymousUser()
+            payload = jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
         except jwt.InvalidTokenError:
-            return AnonymousUser()
+            return None
 
+        exp = payload.get("exp")
+        expires_at = float(exp) if isinstance(exp, (int, float)) else math.inf
+        self._remember(token, payload, expires_at)
+        return payload
 
-class BasicAuthBackend(AuthBackend):
+    def _remember(self, token: str, payload: dict[str, Any], expires_at: float) -> None:
+        """Insert into the bounded cache, evicting the least recently used entry."""
+        if self._cache_size <= 0:
+            return
+        if len(self._cache) >= self._cache_size:
+            self._cache.popitem(last=False)
+        self._cache[token] = (payload, expires_at)
+
+
+class BasicAuthBackend:
     """
     HTTP Basic authentication backend.
     """
@@ -221,33 +292,27 @@ class BasicAuthBackend(AuthBackend):
         self._verify_credentials = verify_credentials
     
     async def authenticate(self, request: Request) -> User | AnonymousUser:
-        import base64
-        
-        auth_header = request.get_header("authorization")
-        
-        if not auth_header:
-            return AnonymousUser()
+        credentials = _credentials(request.get_header("authorization"), "Basic ", "basic ")
+        if credentials is None:
+            return _ANONYMOUS
         
         try:
-            scheme, credentials = auth_header.split(" ", 1)
-        except ValueError:
-            return AnonymousUser()
-        
-        if scheme.lower() != "basic":
-            return AnonymousUser()
-        
-        try:
-            decoded = base64.b64decode(credentials).decode("utf-8")
-            username, password = decoded.split(":", 1)
-        except (ValueError, UnicodeDecodeError):
-            return AnonymousUser()
+            # Split the decoded bytes; ":" is ASCII so it never falls
+            # inside a multi-byte UTF-8 sequence
+            raw_username, sep, raw_password = base64.b64decode(credentials).partition(b":")
+            if not sep:
+                return _ANONYMOUS
+            username = raw_username.decode("utf-8")
+            password = raw_password.decode("utf-8")
+        except ValueError:  # binascii.Error and UnicodeDecodeError
+            return _ANONYMOUS
         
         if self._verify_credentials:
             user = await self._verify_credentials(username, password)
             if user:
                 return user
         
-        return AnonymousUser()
+        return _ANONYMOUS
 
 
 class AuthMiddleware(Middleware):
@@ -265,18 +330,19 @@ class AuthMiddleware(Middleware):
         super().__init__(app)
         self.backend = backend
         self.exclude_paths = exclude_paths or []
+        # str.startswith accepts a tuple and checks every prefix in C
+        self._exclude_prefixes = tuple(self.exclude_paths)
     
     async def process(self, scope: Scope, receive: Receive, send: Send) -> None:
-        request = Request(scope, receive)
-        
-        # Skip authentication for excluded paths
-        if any(request.path.startswith(p) for p in self.exclude_paths):
-            scope["user"] = AnonymousUser()
+        # Skip authentication for excluded paths, before any Request is
+        # built ("path" is a required key of HTTP scopes)
+        if self._exclude_prefixes and scope["path"].startswith(self._exclude_prefixes):
+            scope["user"] = _ANONYMOUS
             await self.app(scope, receive, send)
             return
         
         # Authenticate request
-        user = await self.backend.authenticate(request)
+        user = await self.backend.authenticate(Request(scope, receive))
         scope["user"] = user
         
         await self.app(scope, receive, send)
@@ -287,6 +353,7 @@ def login_required(handler: Any) -> Any:
     Decorator that requires authentication.
     Raises Unauthorized if user is not authenticated.
     """
+    @functools.wraps(handler)
     async def wrapper(request: Request, *args: Any, **kwargs: Any) -> Any:
         user = request._scope.get("user")
         
@@ -295,8 +362,6 @@ def login_required(handler: Any) -> Any:
         
         return await handler(request, *args, **kwargs)
     
-    wrapper.__name__ = handler.__name__
-    wrapper.__doc__ = handler.__doc__
     return wrapper
 
 
@@ -305,21 +370,25 @@ def require_scopes(*required_scopes: str) -> Any:
     Decorator that requires specific scopes/permissions.
     Raises Forbidden if user lacks required scopes.
     """
+    required = frozenset(required_scopes)
+    
     def decorator(handler: Any) -> Any:
+        @functools.wraps(handler)
         async def wrapper(request: Request, *args: Any, **kwargs: Any) -> Any:
             user = request._scope.get("user")
             
             if not user or not user.is_authenticated:
                 raise Unauthorized("Authentication required")
             
-            for scope in required_scopes:
-                if not user.has_scope(scope):
-                    raise Forbidden(f"Missing required scope: {scope}")
+            # One C-level subset test; fall back to has_scope() per scope
+            # to honour custom user objects and name the missing scope
+            if not required.issubset(getattr(user, "scopes", ())):
+                for scope in required_scopes:
+                    if not user.has_scope(scope):
+                        raise Forbidden(f"Missing required scope: {scope}")
             
             return await handler(request, *args, **kwargs)
         
-        wrapper.__name__ = handler.__name__
-        wrapper.__doc__ = handler.__doc__
         return wrapper
     
-    return decorator
\ No newline at end of file
+    return decorator
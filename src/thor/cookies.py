@@ -4,14 +4,46 @@ Implements signing and encryption for cookie security.
 """
 
 import base64
+import enum
 import hashlib
 import hmac
 import json
+import math
+import re
 import secrets
 import time
+import uuid
 from dataclasses import dataclass, field
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speedup — install with ``thor[fast]``
+    orjson = None
+
+# Datetimes and dataclasses go to _json_default (and are rejected), as with json
+_ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+# A run of digits this long may be an integer beyond 64 bits, which
+# orjson.loads would silently turn into a float
+_LONG_DIGITS = re.compile(rb"\d{19}")
+
+# Prefix on every signature naming the MAC that produced it, so the
+# algorithm can be rotated without misreading older cookies
+_SIGNATURE_VERSION: bytes = b"b2."
+
+# Signatures are a 32-byte digest, base64-encoded with its padding kept,
+# so the trailing field is always this wide and never needs re-padding
+_SIGNATURE_LENGTH: int = len(_SIGNATURE_VERSION) + 44
+
+# Unversioned HMAC-SHA256 signatures from before the prefix, base64 with
+# the padding stripped; still accepted so existing cookies stay valid
+_LEGACY_SIGNATURE_LENGTH: int = 43
+
 
 @dataclass(frozen=True, slots=True)
 class CookieOptions:
@@ -49,24 +81,32 @@ class CookieOptions:
 
 class SecureCookie:
     """
-    Secure cookie implementation with HMAC signing.
+    Secure cookie implementation with keyed-MAC signing.
     
     Follows Single Responsibility Principle - handles only cookie security.
-    Uses HMAC-SHA256 for message authentication.
+    Uses keyed BLAKE2b (a single-pass MAC, unlike the double hash of
+    HMAC-SHA256) for message authentication. Unversioned HMAC-SHA256
+    signatures from earlier releases are still verified, but new values
+    are always signed with BLAKE2b.
     """
     
     def __init__(self, secret_key: str | bytes) -> None:
         if isinstance(secret_key, str):
             secret_key = secret_key.encode("utf-8")
-        self._secret_key = secret_key
-        self._hash_algorithm = hashlib.sha256
+        # Raw key for verifying legacy HMAC-SHA256 signatures only
+        self._legacy_key = secret_key
+        # BLAKE2b accepts keys of at most 64 bytes; compress longer ones
+        if len(secret_key) > hashlib.blake2b.MAX_KEY_SIZE:
+            secret_key = hashlib.blake2b(secret_key).digest()
+        self._mac_key = secret_key
     
-    def sign(self, value: str) -> str:
+    def sign(self, value: str | bytes) -> str:
         """Sign a value and return the signed string."""
-        timestamp = str(int(time.time()))
-        value_with_ts = f"{timestamp}:{value}"
-        signature = self._create_signature(value_with_ts)
-        return f"{value_with_ts}:{signature}"
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        value_with_ts = b"%d:%s" % (int(time.time()), value)
+        signed = value_with_ts + b":" + self._create_signature(value_with_ts)
+        return signed.decode("utf-8")
     
     def unsign(
         self,
@@ -77,34 +117,57 @@ class SecureCookie:
         Verify signature and return original value.
         Returns None if signature is invalid or expired.
         """
+        value = self._verify(signed_value.encode("utf-8"), max_age)
+        if value is None:
+            return None
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    
+    def _verify(self, signed_value: bytes, max_age: int | None) -> bytes | None:
+        """Byte-level :meth:`unsign`: return the signed payload or None."""
         try:
-            parts = signed_value.rsplit(":", 2)
-            if len(parts) != 3:
+            # Fixed-width signature at the end; the timestamp is everything
+            # before the first colon, so values may contain colons. A colon
+            # inside the last 44 bytes (never part of a versioned, padded
+            # signature) marks a legacy one
+            legacy = (
+                signed_value[-_LEGACY_SIGNATURE_LENGTH - 1:-_LEGACY_SIGNATURE_LENGTH] == b":"
+            )
+            sig_start = len(signed_value) - (
+                _LEGACY_SIGNATURE_LENGTH if legacy else _SIGNATURE_LENGTH
+            )
+            if sig_start < 1 or signed_value[sig_start - 1:sig_start] != b":":
                 return None
-            
-            timestamp_str, value, signature = parts
-            value_with_ts = f"{timestamp_str}:{value}"
-            
-            # Verify signature using constant-time comparison
-            expected_signature = self._create_signature(value_with_ts)
-            if not hmac.compare_digest(signature, expected_signature):
+            value_with_ts = signed_value[:sig_start - 1]
+            signature = signed_value[sig_start:]
+            timestamp_str, sep, value = value_with_ts.partition(b":")
+            if not sep:
                 return None
             
-            # Check expiration
+            # Check expiration first: stale cookies are common and the
+            # timestamp is not secret, so they can skip the MAC entirely
             if max_age is not None:
                 timestamp = int(timestamp_str)
                 if time.time() - timestamp > max_age:
                     return None
             
+            # Verify signature using constant-time comparison
+            if legacy:
+                expected_signature = self._legacy_signature(value_with_ts)
+            else:
+                expected_signature = self._create_signature(value_with_ts)
+            if not hmac.compare_digest(signature, expected_signature):
+                return None
+            
             return value
         except (ValueError, TypeError):
             return None
     
     def encode_value(self, data: Any) -> str:
         """Encode data to a signed base64 string."""
-        json_data = json.dumps(data, separators=(",", ":"))
-        encoded = base64.urlsafe_b64encode(json_data.encode("utf-8")).decode("ascii")
-        return self.sign(encoded)
+        return self.sign(base64.urlsafe_b64encode(_dumps(data)))
     
     def decode_value(
         self,
@@ -112,24 +175,27 @@ class SecureCookie:
         max_age: int | None = None,
     ) -> Any | None:
         """Decode and verify a signed value. Returns None if invalid."""
-        unsigned = self.unsign(encoded_value, max_age)
-        if unsigned is None:
-            return None
-        
         try:
-            json_data = base64.urlsafe_b64decode(unsigned.encode("ascii")).decode("utf-8")
-            return json.loads(json_data)
-        except (ValueError, TypeError, json.JSONDecodeError):
+            unsigned = self._verify(encoded_value.encode("ascii"), max_age)
+            if unsigned is None:
+                return None
+            return _loads(base64.urlsafe_b64decode(unsigned))
+        except (ValueError, TypeError):  # includes JSON and Unicode errors
             return None
     
-    def _create_signature(self, value: str) -> str:
-        """Create HMAC signature for a value."""
-        signature = hmac.new(
-            self._secret_key,
-            value.encode("utf-8"),
-            self._hash_algorithm,
+    def _create_signature(self, value: bytes) -> bytes:
+        """Create a versioned keyed-BLAKE2b signature for a value."""
+        signature = hashlib.blake2b(
+            value,
+            key=self._mac_key,
+            digest_size=32,
         ).digest()
-        return base64.urlsafe_b64encode(signature).decode("ascii").rstrip("=")
+        return _SIGNATURE_VERSION + base64.urlsafe_b64encode(signature)
+    
+    def _legacy_signature(self, value: bytes) -> bytes:
+        """Unversioned HMAC-SHA256 signature, as cookies were signed before BLAKE2b."""
+        signature = hmac.new(self._legacy_key, value, hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(signature).rstrip(b"=")
     
     @staticmethod
     def generate_secret_key(length: int = 32) -> str:
@@ -137,6 +203,62 @@ class SecureCookie:
         return secrets.token_urlsafe(length)
 
 
+def _json_default(obj: Any) -> Any:
+    """
+    Encode the values ``orjson`` always accepts (UUIDs, enums) the same
+    way on the stdlib path; reject everything else on both.
+    """
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether *obj* contains a NaN or infinite float anywhere."""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize *data* to compact UTF-8 JSON, via ``orjson`` when installed."""
+    if orjson is not None:
+        try:
+            body = orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass  # e.g. non-str keys or huge ints — let json handle it
+        else:
+            # orjson writes non-finite floats as null; json keeps them
+            if b"null" not in body or not _has_non_finite(data):
+                return body
+    return json.dumps(data, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """
+    Parse UTF-8 JSON bytes, via ``orjson`` when installed.
+    
+    Payloads ``orjson`` would misread (long integers) or rejects
+    (``NaN``/``Infinity`` literals) are parsed by ``json`` instead.
+    """
+    if orjson is not None and _LONG_DIGITS.search(data) is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals written by json
+    return json.loads(data)
+
+
 def parse_cookies(cookie_header: str) -> dict[str, str]:
     """Parse a Cookie header string into a dictionary."""
     cookies: dict[str, str] = {}
@@ -144,10 +266,11 @@ def parse_cookies(cookie_header: str) -> dict[str, str]:
     if not cookie_header:
         return cookies
     
+    # One partition per item; the outer strip() the loop used to do is
+    # redundant once key and value are stripped individually
     for item in cookie_header.split(";"):
-        item = item.strip()
-        if "=" in item:
-            key, _, value = item.partition("=")
+        key, sep, value = item.partition("=")
+        if sep:
             cookies[key.strip()] = value.strip()
     
     return cookies
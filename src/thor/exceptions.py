@@ -3,9 +3,16 @@ Thor framework exceptions.
 Following the Single Responsibility Principle - each exception handles one type of error.
 """
 
+import functools
 from typing import Any
 
 
+@functools.lru_cache(maxsize=256)
+def _encode_header(name: str, value: str) -> tuple[bytes, bytes]:
+    """Encode one header pair for ASGI; repeated pairs are encoded once."""
+    return (name.lower().encode("latin-1"), value.encode("latin-1"))
+
+
 class ThorException(Exception):
     """Base exception for all Thor framework errors."""
     
@@ -27,6 +34,11 @@ class HTTPException(ThorException):
         self.detail = detail
         self.headers = headers or {}
         super().__init__(detail)
+    
+    @property
+    def raw_headers(self) -> tuple[tuple[bytes, bytes], ...]:
+        """``headers`` as ASGI ``(name, value)`` byte pairs, lower-cased."""
+        return tuple(_encode_header(name, value) for name, value in self.headers.items())
 
 
 class BadRequest(HTTPException):
@@ -7,8 +7,7 @@ import asyncio
 import logging
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
-from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, TypeAlias
 
 from thor.types import ASGIApp, LifespanHandler, Receive, Scope, Send, State
 
@@ -21,35 +20,11 @@ logging.basicConfig(
 logger = logging.getLogger("thor.lifespan")
 
 
-@dataclass
-class LifespanState:
-    """
-    Application state that persists across the application lifespan.
-    Used for database connections, caches, and other shared resources.
-    """
-    
-    _data: dict[str, Any] = field(default_factory=dict)
-    
-    def __getitem__(self, key: str) -> Any:
-        return self._data[key]
-    
-    def __setitem__(self, key: str, value: Any) -> None:
-        self._data[key] = value
-    
-    def __delitem__(self, key: str) -> None:
-        del self._data[key]
-    
-    def __contains__(self, key: object) -> bool:
-        return key in self._data
-    
-    def get(self, key: str, default: Any = None) -> Any:
-        return self._data.get(key, default)
-    
-    def set(self, key: str, value: Any) -> None:
-        self._data[key] = value
-    
-    def clear(self) -> None:
-        self._data.clear()
+# Application state that persists across the application lifespan:
+# database connections, caches, and other shared resources. A plain
+# dict, so the per-request ``scope["state"]`` reads and writes are
+# C-level dict operations.
+LifespanState: TypeAlias = dict[str, Any]
 
 
 class Lifespan:
@@ -77,7 +52,7 @@ class Lifespan:
         self._startup_handlers: list[LifespanHandler] = []
         self._shutdown_handlers: list[LifespanHandler] = []
         self._context_manager: Callable[[LifespanState], AsyncGenerator[None, None]] | None = None
-        self.state = LifespanState()
+        self.state: LifespanState = {}
     
     def on_startup(self, handler: LifespanHandler) -> LifespanHandler:
         """Decorator to register a startup handler."""
@@ -156,27 +131,35 @@ class LifespanProtocolHandler:
         self.state = self._lifespan.state
         self._shutdown_timeout = shutdown_timeout
         self._inflight: int = 0
-        self._inflight_zero = asyncio.Event()
-        self._inflight_zero.set()  # starts at 0 → already "zero"
+        # Created only while draining, so the per-request path is a bare
+        # counter update with no Event state changes
+        self._inflight_zero: asyncio.Event | None = None
         self._shutting_down: bool = False
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle ASGI messages."""
-        if scope["type"] == "lifespan":
+        scope_type = scope["type"]
+        if scope_type == "lifespan":
             await self._handle_lifespan(scope, receive, send)
-        else:
-            # Add state to scope for request handlers
-            scope["state"] = self.state
+            return
 
-            # Track in-flight requests
-            self._inflight += 1
-            self._inflight_zero.clear()
-            try:
-                await self._app(scope, receive, send)
-            finally:
-                self._inflight -= 1
-                if self._inflight == 0:
-                    self._inflight_zero.set()
+        # Add state to scope for request handlers
+        scope["state"] = self.state
+
+        if scope_type != "http":
+            # Long-lived connections (websockets) must not hold up the
+            # shutdown drain, so only HTTP requests are counted
+            await self._app(scope, receive, send)
+            return
+
+        # Track in-flight requests
+        self._inflight += 1
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            self._inflight -= 1
+            if self._inflight == 0 and self._inflight_zero is not None:
+                self._inflight_zero.set()
 
     # ------------------------------------------------------------------
     # Lifespan protocol
@@ -226,6 +209,7 @@ class LifespanProtocolHandler:
             self._inflight,
             self._shutdown_timeout,
         )
+        self._inflight_zero = asyncio.Event()
         try:
             await asyncio.wait_for(
                 self._inflight_zero.wait(),
@@ -4,10 +4,10 @@ Implements the Chain of Responsibility pattern.
 """
 
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import Any
 
-from thor.types import ASGIApp, Receive, Scope, Send
+from thor.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class Middleware(ABC):
@@ -46,8 +46,10 @@ class MiddlewareStack:
     
     def __init__(self, app: ASGIApp) -> None:
         self._app = app
-        self._middleware: list[type[Middleware] | Callable[[ASGIApp], ASGIApp]] = []
-        self._middleware_options: list[dict[str, Any]] = []
+        # Flat, ordered list of (middleware_class, options) pairs
+        self._entries: list[
+            tuple[type[Middleware] | Callable[[ASGIApp], ASGIApp], dict[str, Any]]
+        ] = []
     
     def add(
         self,
@@ -55,21 +57,70 @@ class MiddlewareStack:
         **options: Any,
     ) -> None:
         """Add middleware to the stack."""
-        self._middleware.append(middleware_class)
-        self._middleware_options.append(options)
+        self._entries.append((middleware_class, options))
     
-    def build(self) -> ASGIApp:
-        """Build the middleware chain."""
+    @property
+    def middleware_classes(self) -> list[type[Middleware] | Callable[[ASGIApp], ASGIApp]]:
+        """Registered middleware, outermost first."""
+        return [middleware_class for middleware_class, _ in self._entries]
+    
+    def build(self, http_only: bool = False) -> ASGIApp:
+        """
+        Build the middleware chain.
+        
+        Args:
+            http_only: Promise that the chain will only ever receive
+                       ``"http"`` scopes (``Thor`` routes websocket and
+                       lifespan scopes elsewhere). Each layer is then
+                       handed the next layer's ``process`` directly,
+                       skipping the per-layer scope-type check and one
+                       coroutine frame per middleware.
+        """
         app = self._app
         
         # Apply middleware in reverse order so first added is outermost
-        for middleware_class, options in zip(
-            reversed(self._middleware),
-            reversed(self._middleware_options),
-        ):
+        for middleware_class, options in reversed(self._entries):
+            if http_only:
+                app = _http_entry(app)
             if options:
                 app = middleware_class(app, **options)
             else:
                 app = middleware_class(app)
         
-        return app
+        return _http_entry(app) if http_only else app
+
+
+class SendWithHeaders:
+    """
+    ``send`` wrapper that appends headers to ``http.response.start``.
+    
+    Middleware hand one of these downstream instead of defining a
+    wrapper closure inside ``process``: a single slotted object per
+    request rather than a function object plus its closure cells.
+    
+    A ``headers`` list on the message is extended in place, so each
+    ``http.response.start`` must carry a list of its own — as every
+    Thor response does — never one shared between sends.
+    """
+    
+    __slots__ = ("headers", "send")
+    
+    def __init__(self, send: Send, headers: Sequence[tuple[bytes, bytes]]) -> None:
+        self.send = send
+        self.headers = headers
+    
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = message.get("headers")
+            if type(headers) is list:
+                headers.extend(self.headers)
+            else:
+                message["headers"] = [*(headers or ()), *self.headers]
+        await self.send(message)
+
+
+def _http_entry(app: ASGIApp) -> ASGIApp:
+    """Return the HTTP-only entry point of *app*: ``process`` for plain middleware."""
+    if isinstance(app, Middleware) and type(app).__call__ is Middleware.__call__:
+        return app.process
+    return app
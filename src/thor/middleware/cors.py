@@ -2,13 +2,43 @@
 CORS (Cross-Origin Resource Sharing) middleware.
 """
 
+import functools
 import re as _re
 from typing import Any
 
-from thor.middleware.base import Middleware
+from thor.middleware.base import Middleware, SendWithHeaders
 from thor.request import Request
 from thor.types import ASGIApp, Receive, Scope, Send
 
+try:
+    import re2
+except ImportError:  # optional — linear-time origin regex, install with ``thor[re2]``
+    re2 = None
+
+# Distinct origins whose CORS headers are remembered per middleware
+_HEADER_CACHE_SIZE: int = 1024
+
+# Constant header pairs, shared by every header tuple that needs them
+_ALLOW_ANY_ORIGIN: tuple[bytes, bytes] = (b"access-control-allow-origin", b"*")
+_VARY_ORIGIN: tuple[bytes, bytes] = (b"vary", b"Origin")
+_ALLOW_CREDENTIALS: tuple[bytes, bytes] = (b"access-control-allow-credentials", b"true")
+
+
+def _compile_origin_regex(pattern: str) -> Any:
+    """
+    Compile ``allow_origin_regex``, preferring RE2 when installed.
+
+    RE2 matches in time linear in the origin's length, so a hostile
+    ``Origin`` header cannot trigger catastrophic backtracking. Patterns
+    RE2 does not support (backreferences, lookaround) fall back to ``re``.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return _re.compile(pattern)
+
 
 class CORSMiddleware(Middleware):
     """
@@ -43,19 +73,43 @@ class CORSMiddleware(Middleware):
         self.max_age = max_age
 
         # Compile optional regex
-        self._origin_regex: _re.Pattern[str] | None = (
-            _re.compile(allow_origin_regex) if allow_origin_regex else None
+        self._origin_regex: Any = (
+            _compile_origin_regex(allow_origin_regex) if allow_origin_regex else None
         )
 
         # Pre-compute wildcard subdomain patterns (e.g. "*.example.com")
-        self._wildcard_origins: list[str] = [
+        # as one tuple, so every suffix is checked by a single C-level
+        # str.endswith call
+        self._wildcard_origins: tuple[str, ...] = tuple(
             o[1:]  # strip leading "*", keep ".example.com"
             for o in self.allow_origins
             if o.startswith("*.") and len(o) > 2
-        ]
+        )
+        # Exact origins for O(1) membership
+        self._exact_origins: frozenset[str] = frozenset(self.allow_origins)
 
         self._allow_all = "*" in self.allow_origins and not self._wildcard_origins
 
+        # Header values that never depend on the origin, encoded once
+        self._expose_headers_value: bytes = ", ".join(self.expose_headers).encode()
+
+        # Preflight-only headers, identical for every origin
+        self._preflight_static_headers: tuple[tuple[bytes, bytes], ...] = (
+            (b"access-control-allow-methods", ", ".join(self.allow_methods).encode()),
+            (b"access-control-allow-headers", ", ".join(self.allow_headers).encode()),
+            (b"access-control-max-age", str(self.max_age).encode()),
+        )
+
+        # origin -> immutable CORS header tuple. Real clients present a
+        # small set of origins; the bound keeps hostile ones from
+        # growing it without limit.
+        self._cors_headers = functools.lru_cache(maxsize=_HEADER_CACHE_SIZE)(
+            self._get_cors_headers
+        )
+        self._preflight_headers = functools.lru_cache(maxsize=_HEADER_CACHE_SIZE)(
+            self._get_preflight_headers
+        )
+
         # Spec violation guard: credentials + bare wildcard
         if self.allow_credentials and self._allow_all and not self._origin_regex:
             raise ValueError(
@@ -63,6 +117,13 @@ class CORSMiddleware(Middleware):
                 "Specify explicit origins or use allow_origin_regex."
             )
 
+        # A bare "*" without credentials sends the same headers whatever
+        # the origin, so swap in a process() that never looks at it
+        if self._allow_all and not self.allow_credentials:
+            self._any_origin_headers = self._get_cors_headers(None)
+            self._any_origin_preflight_headers = self._get_preflight_headers(None)
+            self.process = self._process_any_origin
+
     async def process(self, scope: Scope, receive: Receive, send: Send) -> None:
         request = Request(scope, receive)
         origin = request.get_header("origin")
@@ -71,75 +132,68 @@ class CORSMiddleware(Middleware):
             await self._send_preflight_response(send, origin)
             return
 
-        async def send_with_cors(message: dict[str, Any]) -> None:
-            if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.extend(self._get_cors_headers(origin))
-                message["headers"] = headers
-            await send(message)
+        await self.app(scope, receive, SendWithHeaders(send, self._cors_headers(origin)))
+
+    async def _process_any_origin(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """``process`` for ``allow_origins=["*"]`` without credentials."""
+        if scope["method"] == "OPTIONS":
+            await send({
+                "type": "http.response.start",
+                "status": 204,
+                "headers": list(self._any_origin_preflight_headers),
+            })
+            await send({
+                "type": "http.response.body",
+                "body": b"",
+            })
+            return
 
-        # pyrefly: ignore [bad-argument-type]
-        await self.app(scope, receive, send_with_cors)
+        await self.app(scope, receive, SendWithHeaders(send, self._any_origin_headers))
 
     def _is_origin_allowed(self, origin: str) -> bool:
         """Check if *origin* is allowed by list, wildcard subdomain, or regex."""
-        if self._allow_all:
-            return True
-        if origin in self.allow_origins:
-            return True
-        # Wildcard subdomain: *.example.com  matches  foo.example.com
-        for suffix in self._wildcard_origins:
-            if origin.endswith(suffix):
-                return True
-        # Regex fallback
-        if self._origin_regex and self._origin_regex.fullmatch(origin):
-            return True
-        return False
-
-    def _get_cors_headers(self, origin: str | None) -> list[tuple[bytes, bytes]]:
-        """Generate CORS response headers."""
+        return (
+            self._allow_all
+            or origin in self._exact_origins
+            # Wildcard subdomain: *.example.com  matches  foo.example.com
+            or origin.endswith(self._wildcard_origins)
+            # Regex fallback
+            or (self._origin_regex is not None and self._origin_regex.fullmatch(origin) is not None)
+        )
+
+    def _get_cors_headers(self, origin: str | None) -> tuple[tuple[bytes, bytes], ...]:
+        """Generate CORS response headers (memoised per origin as ``_cors_headers``)."""
         headers: list[tuple[bytes, bytes]] = []
 
         if self._allow_all and not self.allow_credentials:
             # Bare wildcard: no Vary needed
-            headers.append((b"access-control-allow-origin", b"*"))
+            headers.append(_ALLOW_ANY_ORIGIN)
         elif origin and self._is_origin_allowed(origin):
             # Reflect the specific origin back
             headers.append((b"access-control-allow-origin", origin.encode()))
             # Vary: Origin is required when the header is not a bare "*"
-            headers.append((b"vary", b"Origin"))
+            headers.append(_VARY_ORIGIN)
 
         if self.allow_credentials:
-            headers.append((b"access-control-allow-credentials", b"true"))
+            headers.append(_ALLOW_CREDENTIALS)
 
         if self.expose_headers:
-            headers.append((
-                b"access-control-expose-headers",
-                ", ".join(self.expose_headers).encode(),
-            ))
+            headers.append((b"access-control-expose-headers", self._expose_headers_value))
 
-        return headers
+        return tuple(headers)
+
+    def _get_preflight_headers(self, origin: str | None) -> tuple[tuple[bytes, bytes], ...]:
+        """Full preflight header set (memoised per origin as ``_preflight_headers``)."""
+        return self._cors_headers(origin) + self._preflight_static_headers
 
     async def _send_preflight_response(self, send: Send, origin: str | None) -> None:
         """Send a preflight (OPTIONS) response."""
-        headers = self._get_cors_headers(origin)
-        headers.append((
-            b"access-control-allow-methods",
-            ", ".join(self.allow_methods).encode(),
-        ))
-        headers.append((
-            b"access-control-allow-headers",
-            ", ".join(self.allow_headers).encode(),
-        ))
-        headers.append((
-            b"access-control-max-age",
-            str(self.max_age).encode(),
-        ))
-
+        # Fresh message dicts and header list every time: send wrappers
+        # further out may rewrite message["headers"] in place
         await send({
             "type": "http.response.start",
             "status": 204,
-            "headers": headers,
+            "headers": list(self._preflight_headers(origin)),
         })
         await send({
             "type": "http.response.body",
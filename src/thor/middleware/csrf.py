@@ -4,11 +4,12 @@ CSRF (Cross-Site Request Forgery) protection middleware.
 
 import hmac
 import secrets
-from typing import Any
+from urllib.parse import quote_plus, unquote_plus
 
 from thor.cookies import CookieOptions, format_set_cookie
-from thor.middleware.base import Middleware
+from thor.middleware.base import Middleware, SendWithHeaders
 from thor.request import Request
+from thor.response import JSONResponse
 from thor.types import ASGIApp, Receive, Scope, Send
 
 # HTTP methods that are considered "safe" (read-only) and exempt from CSRF checks
@@ -20,6 +21,9 @@ DEFAULT_HEADER_NAME: str = "x-csrf-token"
 DEFAULT_FORM_FIELD: str = "_csrf_token"
 DEFAULT_TOKEN_LENGTH: int = 32
 
+# Response header used to set / refresh the token cookie
+_SET_COOKIE: bytes = b"set-cookie"
+
 
 class CSRFMiddleware(Middleware):
     """
@@ -59,9 +63,12 @@ class CSRFMiddleware(Middleware):
         self._cookie_name = cookie_name
         self._header_name = header_name
         self._form_field = form_field
+        # "<field>=" as it appears in a URL-encoded body
+        self._form_key = quote_plus(form_field).encode() + b"="
         self._token_length = token_length
         self._safe_methods = safe_methods
-        self._exclude_paths = exclude_paths or []
+        # str.startswith accepts a tuple and checks every prefix in C
+        self._exclude_prefixes = tuple(exclude_paths or ())
         # CSRF cookie must be readable by JS; httponly=False by design
         self._cookie_options = cookie_options or CookieOptions(
             httponly=False,
@@ -75,16 +82,13 @@ class CSRFMiddleware(Middleware):
         return secrets.token_urlsafe(self._token_length)
 
     async def process(self, scope: Scope, receive: Receive, send: Send) -> None:
-        from thor.exceptions import Forbidden
-        from thor.response import JSONResponse
-
-        request = Request(scope, receive)
-
-        # Skip excluded paths
-        if any(request.path.startswith(p) for p in self._exclude_paths):
+        # Skip excluded paths, before any Request is built
+        if self._exclude_prefixes and scope["path"].startswith(self._exclude_prefixes):
             await self.app(scope, receive, send)
             return
 
+        request = Request(scope, receive)
+
         # Retrieve or generate token
         cookie_token = request.get_cookie(self._cookie_name)
 
@@ -114,34 +118,39 @@ class CSRFMiddleware(Middleware):
                 return
 
         # Wrap send to ensure CSRF cookie is always set / refreshed
-        async def send_with_csrf(message: dict[str, Any]) -> None:
-            if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                cookie_value = format_set_cookie(
-                    self._cookie_name,
-                    # pyrefly: ignore [bad-argument-type]
-                    cookie_token,
-                    self._cookie_options,
-                )
-                headers.append((b"set-cookie", cookie_value.encode("latin-1")))
-                message["headers"] = headers
-            await send(message)
-
-        # pyrefly: ignore [bad-argument-type]
-        await self.app(scope, receive, send_with_csrf)
+        cookie_value = format_set_cookie(self._cookie_name, cookie_token, self._cookie_options)
+        cookie_header = ((_SET_COOKIE, cookie_value.encode("latin-1")),)
+        await self.app(scope, receive, SendWithHeaders(send, cookie_header))
 
     @staticmethod
     def _tokens_match(expected: str, submitted: str) -> bool:
         """Constant-time comparison to prevent timing attacks."""
-        return hmac.compare_digest(expected.encode(), submitted.encode())
-
-    @staticmethod
-    async def _get_form_token(request: Request) -> str | None:
-        """Try to extract CSRF token from form body."""
-        if "application/x-www-form-urlencoded" in request.content_type:
-            form = await request.form()
-            value = form.get(DEFAULT_FORM_FIELD)
-            if isinstance(value, list):
-                return value[0] if value else None
-            return value
-        return None
+        try:
+            # compare_digest takes ASCII str as-is, so no encoded copies
+            return hmac.compare_digest(expected, submitted)
+        except TypeError:
+            # Non-ASCII input can never equal a generated token
+            return False
+
+    async def _get_form_token(self, request: Request) -> str | None:
+        """
+        Try to extract CSRF token from form body.
+
+        Scans the raw body for the one field instead of parsing the
+        whole form; the body stays cached on the request, so handlers
+        can still call ``request.form()``.
+        """
+        if "application/x-www-form-urlencoded" not in request.content_type:
+            return None
+        body = await request.body()
+        key = self._form_key
+        if body.startswith(key):
+            start = len(key)
+        else:
+            index = body.find(b"&" + key)
+            if index < 0:
+                return None
+            start = index + 1 + len(key)
+        end = body.find(b"&", start)
+        raw = body[start:] if end < 0 else body[start:end]
+        return unquote_plus(raw.decode("latin-1"))
@@ -3,12 +3,16 @@ Error handling middleware.
 """
 
 import logging
-import uuid
-from typing import Any
+import os
 
-from thor.middleware.base import Middleware
+from thor.exceptions import HTTPException
+from thor.middleware.base import Middleware, SendWithHeaders
+from thor.response import JSONResponse
 from thor.types import ASGIApp, Receive, Scope, Send
 
+# Response header carrying the request ID
+_REQUEST_ID_HEADER: bytes = b"x-request-id"
+
 
 class ErrorHandlerMiddleware(Middleware):
     """
@@ -30,22 +34,14 @@ class ErrorHandlerMiddleware(Middleware):
         self._logger = logging.getLogger("thor.errors")
     
     async def process(self, scope: Scope, receive: Receive, send: Send) -> None:
-        from thor.exceptions import HTTPException
-        from thor.response import JSONResponse
-        
-        request_id = str(uuid.uuid4())
+        # 128 random bits as 32 hex digits, without building a UUID object
+        request_id = os.urandom(16).hex()
         scope["request_id"] = request_id
         
-        # Inject X-Request-ID header into every response
-        async def send_with_request_id(message: dict[str, Any]) -> None:
-            if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.append((b"x-request-id", request_id.encode()))
-                message["headers"] = headers
-            await send(message)
+        # Inject X-Request-ID header into every response, encoded once
+        send_with_request_id = SendWithHeaders(send, ((_REQUEST_ID_HEADER, request_id.encode("ascii")),))
         
         try:
-            # pyrefly: ignore [bad-argument-type]
             await self.app(scope, receive, send_with_request_id)
         except HTTPException as exc:
             # Log client errors at warning, server errors at error
@@ -67,9 +63,7 @@ class ErrorHandlerMiddleware(Middleware):
                     "request_id": request_id,
                 },
                 status_code=exc.status_code,
-                headers=exc.headers,
-            )
-            # pyrefly: ignore [bad-argument-type]
+            ).extend_raw_headers(exc.raw_headers)
             await response(send_with_request_id)
         except Exception as exc:
             # Always log full traceback server-side
@@ -86,5 +80,4 @@ class ErrorHandlerMiddleware(Middleware):
                 },
                 status_code=500,
             )
-            # pyrefly: ignore [bad-argument-type]
             await response(send_with_request_id)
@@ -2,20 +2,42 @@
 Rate limiting middleware.
 """
 
+import asyncio
 import logging
-import time
-from typing import Any
+import math
+from collections import OrderedDict
 
-from thor.middleware.base import Middleware
+from thor.middleware.base import Middleware, SendWithHeaders
+from thor.response import JSONResponse
 from thor.types import ASGIApp, Receive, Scope, Send
 
+# Default cap on the number of clients tracked at once
+DEFAULT_MAX_CLIENTS: int = 10_000
+
+# Number of independent bucket tables (a power of two)
+_SHARD_COUNT: int = 16
+
+# Header values up to this are encoded once at startup
+_MAX_PRECOMPUTED_VALUE: int = 4096
+
 
 class RateLimitMiddleware(Middleware):
     """
-    Per-client rate limiting using a sliding window counter.
+    Per-client rate limiting using a token bucket.
 
-    Tracks request counts per client IP address in memory.
-    Returns 429 Too Many Requests when the limit is exceeded.
+    Each client IP gets a bucket holding up to ``max_requests`` tokens,
+    refilled continuously at ``max_requests / window_seconds`` tokens per
+    second; every request spends one. State is two floats per client, and
+    at most ``max_clients`` clients are tracked — the least recently seen
+    is forgotten first. Returns 429 Too Many Requests when the bucket
+    is empty.
+
+    Buckets are spread over 16 small tables by client hash, so growth
+    rehashes and evictions touch one small table instead of one large
+    one. The cap applies to all tables together; once it is reached, a
+    new client evicts the least recently seen client of its own table
+    (or of the next non-empty one), so eviction order is only
+    approximately least-recently-seen overall.
 
     Usage:
         app.add_middleware(
@@ -30,33 +52,54 @@ class RateLimitMiddleware(Middleware):
         app: ASGIApp,
         max_requests: int = 100,
         window_seconds: int = 60,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
     ) -> None:
         super().__init__(app)
         self._max_requests = max_requests
         self._window = window_seconds
-        # client_ip -> list of request timestamps
-        self._requests: dict[str, list[float]] = {}
+        self._rate = max_requests / window_seconds  # tokens per second
+        self._max_clients = max(1, max_clients)
+        # Buckets held across all shards
+        self._tracked = 0
+        # client_ip -> (tokens left, loop time of last update),
+        # least recently seen first, sharded by hash(client_ip)
+        self._shards: tuple[OrderedDict[str, tuple[float, float]], ...] = tuple(
+            OrderedDict() for _ in range(_SHARD_COUNT)
+        )
         self._logger = logging.getLogger("thor.ratelimit")
+        # Header pairs encoded up front: the limit is constant, and
+        # remaining / reset are small integers looked up by value
+        self._limit_header = (b"x-ratelimit-limit", str(max_requests).encode())
+        self._remaining_headers = _encoded_pairs(b"x-ratelimit-remaining", max_requests)
+        self._reset_headers = _encoded_pairs(b"x-ratelimit-reset", math.ceil(window_seconds))
 
     async def process(self, scope: Scope, receive: Receive, send: Send) -> None:
-        from thor.exceptions import TooManyRequests
-        from thor.response import JSONResponse
-
         client = scope.get("client")
         client_ip = client[0] if client else "unknown"
-        now = time.monotonic()
+        # The loop's monotonic clock: uvloop (``thor[fast]``) returns the
+        # time cached for the current tick instead of reading the clock
+        now = asyncio.get_running_loop().time()
 
-        # Prune old timestamps outside the window
-        window_start = now - self._window
-        timestamps = self._requests.get(client_ip, [])
-        timestamps = [t for t in timestamps if t > window_start]
+        # Refill the bucket for the time elapsed since the last request
+        buckets = self._shards[hash(client_ip) & (_SHARD_COUNT - 1)]
+        state = buckets.get(client_ip)
+        if state is None:
+            tokens = float(self._max_requests)
+            if self._tracked >= self._max_clients:
+                self._evict(buckets)
+            else:
+                self._tracked += 1
+        else:
+            tokens, last = state
+            tokens = min(float(self._max_requests), tokens + (now - last) * self._rate)
+            buckets.move_to_end(client_ip)
 
-        if len(timestamps) >= self._max_requests:
-            retry_after = int(self._window - (now - timestamps[0])) + 1
+        if tokens < 1:
+            buckets[client_ip] = (tokens, now)
+            retry_after = math.ceil((1 - tokens) / self._rate)
             self._logger.warning(
-                "Rate limit exceeded for %s (%d/%d in %ds)",
+                "Rate limit exceeded for %s (%d per %ds)",
                 client_ip,
-                len(timestamps),
                 self._max_requests,
                 self._window,
             )
@@ -72,20 +115,36 @@ class RateLimitMiddleware(Middleware):
             await response(send)
             return
 
-        timestamps.append(now)
-        self._requests[client_ip] = timestamps
+        tokens -= 1
+        buckets[client_ip] = (tokens, now)
 
         # Inject rate limit info headers
-        remaining = self._max_requests - len(timestamps)
-
-        async def send_with_ratelimit(message: dict[str, Any]) -> None:
-            if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.append((b"x-ratelimit-limit", str(self._max_requests).encode()))
-                headers.append((b"x-ratelimit-remaining", str(remaining).encode()))
-                headers.append((b"x-ratelimit-reset", str(int(self._window)).encode()))
-                message["headers"] = headers
-            await send(message)
-
-        # pyrefly: ignore [bad-argument-type]
-        await self.app(scope, receive, send_with_ratelimit)
+        headers = (
+            self._limit_header,
+            _lookup_pair(self._remaining_headers, int(tokens)),
+            # Seconds until the bucket is full again
+            _lookup_pair(
+                self._reset_headers,
+                math.ceil((self._max_requests - tokens) / self._rate),
+            ),
+        )
+        await self.app(scope, receive, SendWithHeaders(send, headers))
+
+    def _evict(self, buckets: OrderedDict[str, tuple[float, float]]) -> None:
+        """Forget the least recently seen client, preferring *buckets*' own table."""
+        if not buckets:
+            buckets = next(shard for shard in self._shards if shard)
+        buckets.popitem(last=False)
+
+
+def _encoded_pairs(name: bytes, largest: int) -> tuple[tuple[bytes, bytes], ...]:
+    """Header pairs ``(name, b"0") .. (name, b"<largest>")``, capped in length."""
+    count = min(largest, _MAX_PRECOMPUTED_VALUE) + 1
+    return tuple((name, str(value).encode()) for value in range(count))
+
+
+def _lookup_pair(pairs: tuple[tuple[bytes, bytes], ...], value: int) -> tuple[bytes, bytes]:
+    """Return the pre-encoded pair for *value*, encoding it if out of range."""
+    if value < len(pairs):
+        return pairs[value]
+    return (pairs[0][0], str(value).encode())
@@ -5,6 +5,7 @@ Request timeout middleware.
 import asyncio
 import logging
 
+from thor.exceptions import RequestTimeout
 from thor.middleware.base import Middleware
 from thor.types import ASGIApp, Receive, Scope, Send
 
@@ -13,10 +14,10 @@ class TimeoutMiddleware(Middleware):
     """
     Per-request timeout enforcement.
 
-    Wraps each request handler invocation with ``asyncio.wait_for``.
-    If the handler does not complete within the configured timeout,
-    a 504 Gateway Timeout response is returned to the client and
-    the handler task is cancelled.
+    Runs each request handler under ``asyncio.timeout``. If the
+    handler does not complete within the configured timeout, it is
+    cancelled and a 504 Gateway Timeout response is returned to the
+    client.
 
     Usage:
         app.add_middleware(TimeoutMiddleware, timeout=15.0)
@@ -32,14 +33,11 @@ class TimeoutMiddleware(Middleware):
         self._logger = logging.getLogger("thor.timeout")
 
     async def process(self, scope: Scope, receive: Receive, send: Send) -> None:
-        from thor.exceptions import RequestTimeout
-
         try:
-            await asyncio.wait_for(
-                self.app(scope, receive, send),
-                timeout=self._timeout,
-            )
-        except asyncio.TimeoutError:
+            # Deadline on the current task — no inner Task per request
+            async with asyncio.timeout(self._timeout):
+                await self.app(scope, receive, send)
+        except TimeoutError:
             request_id = scope.get("request_id", "-")
             path = scope.get("path", "-")
             self._logger.warning(
@@ -1,15 +1,41 @@
 """
 Multipart form-data parser for Thor framework.
 
-Provides ``UploadFile`` for individual file uploads and
-``parse_multipart`` to decode ``multipart/form-data`` request bodies.
+Provides ``UploadFile`` for individual file uploads,
+``parse_multipart`` to decode buffered ``multipart/form-data`` bodies
+and ``parse_multipart_stream`` to decode them straight off ``receive``.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import io
+import tempfile
 from dataclasses import dataclass, field
-from typing import Any
+from typing import IO
+
+from thor.types import Receive
+
+# Uploads up to this size stay in memory; larger ones spill to disk
+SPOOL_MAX_SIZE: int = 1_048_576
+
+# Distinct part-header blocks whose parsed form is remembered. Forms
+# repeat the same field headers on every submission.
+_PART_HEADER_CACHE_SIZE: int = 512
+
+# States of the parse_multipart_stream state machine
+_PREAMBLE = "preamble"
+_DELIMITER = "delimiter"
+_HEADERS = "headers"
+_CONTENT = "content"
+_DONE = "done"
+
+
+def _spooled_file() -> IO[bytes]:
+    """Create the buffer backing an :class:`UploadFile`."""
+    # pyrefly: ignore [bad-return]
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
 
 
 @dataclass
@@ -22,21 +48,34 @@ class UploadFile:
         content_type: MIME type declared by the client (default
             ``application/octet-stream``).
         headers: Raw headers for this part.
-        file: In-memory bytes buffer containing the upload contents.
+        file: Spooled temporary file holding the upload contents; it
+            stays in memory up to ``SPOOL_MAX_SIZE`` bytes and moves
+            to disk beyond that.
     """
 
     filename: str
     content_type: str = "application/octet-stream"
     headers: dict[str, str] = field(default_factory=dict)
-    file: io.BytesIO = field(default_factory=io.BytesIO, repr=False)
+    file: IO[bytes] = field(default_factory=_spooled_file, repr=False)
+    # Byte count recorded by the parsers as content is written, so
+    # ``size`` needs no file operations; None for hand-built uploads
+    _size: int | None = field(default=None, init=False, repr=False)
 
     # ------------------------------------------------------------------
     # Convenience API
     # ------------------------------------------------------------------
 
     async def read(self, size: int = -1) -> bytes:
-        """Read file contents (async-compatible wrapper)."""
-        return self.file.read(size)
+        """
+        Read file contents.
+
+        In-memory buffers are read inline; once the upload has spilled
+        to disk the read runs in a worker thread so it cannot block the
+        event loop.
+        """
+        if self._in_memory():
+            return self.file.read(size)
+        return await asyncio.to_thread(self.file.read, size)
 
     async def seek(self, offset: int) -> None:
         self.file.seek(offset)
@@ -44,6 +83,8 @@ class UploadFile:
     @property
     def size(self) -> int:
         """Total size of the upload in bytes."""
+        if self._size is not None:
+            return self._size
         pos = self.file.tell()
         self.file.seek(0, 2)
         length = self.file.tell()
@@ -53,6 +94,12 @@ class UploadFile:
     def close(self) -> None:
         self.file.close()
 
+    def _in_memory(self) -> bool:
+        """Whether the contents are still held in memory."""
+        if isinstance(self.file, tempfile.SpooledTemporaryFile):
+            return not self.file._rolled
+        return isinstance(self.file, io.BytesIO)
+
     def __del__(self) -> None:
         try:
             self.file.close()
@@ -100,62 +147,186 @@ def parse_multipart(
     form_fields: dict[str, str | list[str]] = {}
     files: list[UploadFile] = []
 
-    # Boundaries are prefixed with "--" in the body
+    # Boundaries are prefixed with "--" in the body; after the first,
+    # each one also follows the line break that ends the previous part
     delimiter = f"--{boundary}".encode()
-    end_delimiter = f"--{boundary}--".encode()
+    separator = b"\r\n" + delimiter
+    view = memoryview(body)
 
-    # Split on the boundary
-    parts = body.split(delimiter)
-
-    for part in parts:
-        # Skip the preamble and the closing delimiter
-        stripped = part.strip(b"\r\n")
-        if not stripped or stripped == b"--" or stripped.startswith(end_delimiter):
-            continue
+    # Walk the body delimiter to delimiter with bytes.find (a two-way
+    # search in C) rather than split(): no list of part copies, and each
+    # part is sliced as a zero-copy view. Anything before the first
+    # delimiter is preamble.
+    pos = body.find(delimiter)
+    if pos >= 0:
+        pos += len(delimiter)
+    while pos >= 0:
+        # "--" straight after a delimiter marks the closing boundary
+        if body.startswith(b"--", pos):
+            break
+        nxt = body.find(separator, pos)
+        end = nxt if nxt >= 0 else len(body)
 
         # Separate headers from body (double CRLF)
-        header_end = part.find(b"\r\n\r\n")
-        if header_end == -1:
-            continue
-
-        raw_headers = part[:header_end]
-        part_body = part[header_end + 4 :]
-        # Trim trailing \r\n
-        if part_body.endswith(b"\r\n"):
-            part_body = part_body[:-2]
-
-        # Parse part headers
-        part_headers: dict[str, str] = {}
-        for line in raw_headers.split(b"\r\n"):
-            line_str = line.decode("utf-8", errors="replace").strip()
-            if ":" in line_str:
-                hname, _, hval = line_str.partition(":")
-                part_headers[hname.strip().lower()] = hval.strip()
-
-        disposition = part_headers.get("content-disposition", "")
-        disp_params = _parse_content_disposition(disposition)
-        field_name = disp_params.get("name", "")
-
-        if "filename" in disp_params:
-            # File upload
-            ct = part_headers.get("content-type", "application/octet-stream")
-            buf = io.BytesIO(part_body)
-            upload = UploadFile(
-                filename=disp_params["filename"],
-                content_type=ct,
-                headers=part_headers,
-                file=buf,
+        header_end = body.find(b"\r\n\r\n", pos, end)
+        if header_end >= 0:
+            _add_part(
+                view[pos:header_end],
+                view[header_end + 4 : end],
+                form_fields,
+                files,
             )
-            files.append(upload)
-        else:
-            # Regular form field
-            value = part_body.decode("utf-8", errors="replace")
-            existing = form_fields.get(field_name)
-            if existing is None:
-                form_fields[field_name] = value
-            elif isinstance(existing, list):
-                existing.append(value)
-            else:
-                form_fields[field_name] = [existing, value]
+        pos = nxt + len(separator) if nxt >= 0 else -1
+
+    return form_fields, files
+
+
+def _add_part(
+    raw_headers: memoryview,
+    part_body: memoryview,
+    form_fields: dict[str, str | list[str]],
+    files: list[UploadFile],
+) -> None:
+    """Decode one part and record it as a form field or an upload."""
+    part_headers, disp_params = _parse_part_headers(bytes(raw_headers))
+    if "filename" in disp_params:
+        upload = _new_upload(part_headers, disp_params)
+        upload.file.write(part_body)
+        upload.file.seek(0)
+        upload._size = len(part_body)
+        files.append(upload)
+    else:
+        # Regular form field, decoded straight from the view
+        _add_field(form_fields, disp_params.get("name", ""), str(part_body, "utf-8", "replace"))
+
+
+@functools.lru_cache(maxsize=_PART_HEADER_CACHE_SIZE)
+def _parse_part_headers(raw_headers: bytes) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Return a part's headers and its ``Content-Disposition`` parameters.
+
+    Memoised on the raw header block; callers must not mutate the
+    returned dicts.
+    """
+    part_headers: dict[str, str] = {}
+    for line in raw_headers.decode("utf-8", errors="replace").split("\r\n"):
+        hname, sep, hval = line.partition(":")
+        if sep:
+            part_headers[hname.strip().lower()] = hval.strip()
+    disposition = part_headers.get("content-disposition", "")
+    return part_headers, _parse_content_disposition(disposition)
+
+
+def _new_upload(part_headers: dict[str, str], disp_params: dict[str, str]) -> UploadFile:
+    """Create an empty :class:`UploadFile` for a file part."""
+    return UploadFile(
+        filename=disp_params["filename"],
+        content_type=part_headers.get("content-type", "application/octet-stream"),
+        headers=dict(part_headers),
+    )
+
+
+def _add_field(form_fields: dict[str, str | list[str]], name: str, value: str) -> None:
+    """Record a form field, collecting repeated names into a list."""
+    existing = form_fields.get(name)
+    if existing is None:
+        form_fields[name] = value
+    elif isinstance(existing, list):
+        existing.append(value)
+    else:
+        form_fields[name] = [existing, value]
+
+
+async def parse_multipart_stream(
+    receive: Receive,
+    boundary: str,
+) -> tuple[dict[str, str | list[str]], list[UploadFile]]:
+    """
+    Parse a ``multipart/form-data`` body as it arrives from *receive*.
+
+    File contents are written to each upload's spooled file chunk by
+    chunk, so only a small rolling buffer (plus the text fields) is
+    held in memory however large the uploads are. Returns the same
+    ``(form_fields, files)`` tuple as :func:`parse_multipart`.
+
+    Parameters:
+        receive: ASGI receive callable for an ``http`` scope.
+        boundary: The multipart boundary string.
+    """
+    form_fields: dict[str, str | list[str]] = {}
+    files: list[UploadFile] = []
+
+    delimiter = f"--{boundary}".encode()
+    # Inside a part the delimiter always follows a line break
+    separator = b"\r\n" + delimiter
+    # Bytes that must stay buffered in case a delimiter straddles chunks
+    keep = len(separator) - 1
+
+    buffer = bytearray()
+    state = _PREAMBLE
+    upload: UploadFile | None = None
+    upload_size = 0
+    field_name = ""
+    field_value = bytearray()
+    more_body = True
+
+    while more_body:
+        message = await receive()
+        buffer += message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        while True:
+            if state is _PREAMBLE:
+                idx = buffer.find(delimiter)
+                if idx < 0:
+                    del buffer[: max(len(buffer) - keep, 0)]
+                    break
+                del buffer[: idx + len(delimiter)]
+                state = _DELIMITER
+            elif state is _DELIMITER:
+                if len(buffer) < 2:
+                    break
+                # "--" straight after a delimiter marks the closing boundary
+                state = _DONE if buffer.startswith(b"--") else _HEADERS
+            elif state is _HEADERS:
+                idx = buffer.find(b"\r\n\r\n")
+                if idx < 0:
+                    break
+                part_headers, disp_params = _parse_part_headers(bytes(buffer[:idx]))
+                del buffer[: idx + 4]
+                if "filename" in disp_params:
+                    upload = _new_upload(part_headers, disp_params)
+                    upload_size = 0
+                else:
+                    upload = None
+                    field_name = disp_params.get("name", "")
+                    field_value.clear()
+                state = _CONTENT
+            elif state is _CONTENT:
+                idx = buffer.find(separator)
+                chunk_end = idx if idx >= 0 else max(len(buffer) - keep, 0)
+                if upload is not None:
+                    upload.file.write(buffer[:chunk_end])
+                    upload_size += chunk_end
+                else:
+                    field_value += buffer[:chunk_end]
+                if idx < 0:
+                    del buffer[:chunk_end]
+                    break
+                del buffer[: idx + len(separator)]
+                if upload is not None:
+                    upload.file.seek(0)
+                    upload._size = upload_size
+                    files.append(upload)
+                    upload = None
+                else:
+                    _add_field(form_fields, field_name, field_value.decode("utf-8", errors="replace"))
+                state = _DELIMITER
+            else:  # _DONE: drain the epilogue
+                buffer.clear()
+                break
 
+    if upload is not None:
+        # Truncated body: drop the unfinished upload
+        upload.close()
     return form_fields, files
@@ -4,17 +4,44 @@ Encapsulates all HTTP request data and parsing.
 """
 
 import json
-from collections.abc import Mapping
-from functools import cached_property
+import re
+from collections.abc import AsyncIterator, Mapping
+from functools import lru_cache
 from typing import Any
-from urllib.parse import parse_qs, unquote
+from urllib.parse import parse_qsl, unquote
 
 from thor.cookies import parse_cookies
-from thor.types import Receive, Scope, State
+from thor.exceptions import BadRequest, PayloadTooLarge
+from thor.multipart import UploadFile, parse_multipart, parse_multipart_stream
+from thor.types import Message, Receive, Scope, State
+
+try:
+    import orjson
+except ImportError:  # optional speedup — install with ``thor[fast]``
+    orjson = None
 
 # Default maximum request body size: 1 MB
 DEFAULT_MAX_BODY_SIZE: int = 1_048_576
 
+# Scope key holding (raw header list, its length, decoded header dict),
+# shared by every Request built over the same scope
+_HEADERS_MAP_KEY: str = "_headers_map"
+
+# Scope key holding the body once read, so a Request built further down
+# the chain (after middleware read it) does not wait on receive again
+_BODY_KEY: str = "_body"
+
+# Raw header name -> decoded, lower-cased name. Clients send the same
+# few dozen names on every request; the cap keeps hostile ones out.
+_HEADER_NAMES: dict[bytes, str] = {}
+_HEADER_NAMES_MAX: int = 1024
+
+# Request._content_length before the header has been parsed
+_UNPARSED: int = -1
+
+# "; boundary=..." parameter of a multipart Content-Type, quoted or not
+_BOUNDARY_RE: re.Pattern[str] = re.compile(r';\s*boundary=(?:"([^"]*)"|([^;\s]*))', re.IGNORECASE)
+
 
 class Request:
     """
@@ -22,8 +49,32 @@ class Request:
     
     Follows Single Responsibility Principle - handles only request data.
     Uses lazy loading for body parsing to optimize performance.
+    
+    Only ``method`` and ``path`` (needed for routing) are read eagerly.
+    Headers, cookies, and the query string are decoded and parsed on
+    first access, then cached in a slot for the lifetime of the request.
     """
     
+    # Several Requests are built per request (middleware, handler): slots
+    # keep each one small and cache hits a fixed-offset load
+    __slots__ = (
+        "_body",
+        "_body_consumed",
+        "_bytes_received",
+        "_content_length",
+        "_cookies",
+        "_headers",
+        "_max_body_size",
+        "_multipart",
+        "_query_params",
+        "_query_string",
+        "_receive",
+        "_scope",
+        "_state",
+        "method",
+        "path",
+    )
+    
     def __init__(
         self,
         scope: Scope,
@@ -34,56 +85,97 @@ class Request:
         self._receive = receive
         self._body: bytes | None = None
         self._body_consumed = False
+        self._bytes_received = 0
+        self._multipart: tuple[Mapping[str, str | list[str]], list[UploadFile]] | None = None
         self._max_body_size = max_body_size
-        self.state: State = {}
+        self._query_string: str | None = None
+        self._query_params: Mapping[str, str | list[str]] | None = None
+        self._headers: Mapping[str, str] | None = None
+        self._cookies: Mapping[str, str] | None = None
+        self._content_length: int | None = _UNPARSED
+        self._state: State | None = None
+        # HTTP method (GET, POST, etc.)
+        self.method: str = scope.get("method", "GET")
+        # Request path
+        self.path: str = scope.get("path", "/")
     
     @property
-    def method(self) -> str:
-        """HTTP method (GET, POST, etc.)."""
-        return self._scope.get("method", "GET")
+    def state(self) -> State:
+        """Per-request storage for handlers and middleware, created on first use."""
+        if self._state is None:
+            self._state = {}
+        return self._state
     
-    @property
-    def path(self) -> str:
-        """Request path."""
-        return self._scope.get("path", "/")
+    @state.setter
+    def state(self, value: State) -> None:
+        self._state = value
     
     @property
     def query_string(self) -> str:
         """Raw query string."""
-        return self._scope.get("query_string", b"").decode("utf-8")
+        if self._query_string is None:
+            self._query_string = self._scope.get("query_string", b"").decode("utf-8")
+        return self._query_string
     
-    @cached_property
+    @property
     def query_params(self) -> Mapping[str, str | list[str]]:
         """Parsed query parameters."""
-        params: dict[str, str | list[str]] = {}
-        parsed = parse_qs(self.query_string, keep_blank_values=True)
-        
-        for key, values in parsed.items():
-            if len(values) == 1:
-                params[key] = values[0]
-            else:
-                params[key] = values
-        
-        return params
+        if self._query_params is None:
+            self._query_params = self._parse_query_params()
+        return self._query_params
     
-    @cached_property
+    def _parse_query_params(self) -> dict[str, str | list[str]]:
+        """Parse the query string into single values or lists."""
+        query_string = self.query_string
+        if not query_string:
+            return {}
+        return _parse_urlencoded(query_string)
+    
+    @property
     def headers(self) -> Mapping[str, str]:
-        """Request headers as a dictionary."""
-        headers: dict[str, str] = {}
+        """
+        Request headers as a dictionary.
+        
+        Decoded once per scope: middleware and the route handler each
+        build their own Request, but share the dict stashed on the
+        scope as long as ``scope["headers"]`` has not been replaced or
+        grown/shrunk in place. Middleware that rewrites an entry in
+        place should assign a new list instead.
+        """
+        if self._headers is None:
+            self._headers = self._decode_headers()
+        return self._headers
+    
+    def _decode_headers(self) -> Mapping[str, str]:
+        """Decode the raw header list, reusing the scope's copy if current."""
         raw_headers = self._scope.get("headers", [])
+        cached = self._scope.get(_HEADERS_MAP_KEY)
+        if cached is not None and cached[0] is raw_headers and cached[1] == len(raw_headers):
+            return cached[2]
         
+        # Names come from the shared cache (one dict lookup instead of a
+        # decode plus a lower()); only values are decoded per request.
+        # latin-1 is decoded with an ASCII fast path inside CPython, so an
+        # isascii() gate or an ascii-first attempt only adds work.
+        names = _HEADER_NAMES
+        headers: dict[str, str] = {}
         for name, value in raw_headers:
-            header_name = name.decode("latin-1").lower()
-            header_value = value.decode("latin-1")
-            headers[header_name] = header_value
+            header_name = names.get(name)
+            if header_name is None:
+                header_name = name.decode("latin-1").lower()
+                if len(names) < _HEADER_NAMES_MAX:
+                    names[name] = header_name
+            headers[header_name] = value.decode("latin-1")
         
+        self._scope[_HEADERS_MAP_KEY] = (raw_headers, len(raw_headers), headers)
         return headers
     
-    @cached_property
+    @property
     def cookies(self) -> Mapping[str, str]:
         """Request cookies."""
-        cookie_header = self.headers.get("cookie", "")
-        return parse_cookies(cookie_header)
+        if self._cookies is None:
+            self._cookies = parse_cookies(self.headers.get("cookie", ""))
+        return self._cookies
     
     @property
     def content_type(self) -> str:
@@ -92,9 +184,17 @@ class Request:
     
     @property
     def content_length(self) -> int | None:
-        """Content-Length header value."""
-        length = self.headers.get("content-length")
-        return int(length) if length else None
+        """Content-Length header value; ``None`` if missing or invalid."""
+        if self._content_length == _UNPARSED:
+            # Parsed once: body(), multipart() and stream() all check it
+            length = self.headers.get("content-length", "")
+            try:
+                self._content_length = (
+                    int(length) if length.isascii() and length.isdigit() else None
+                )
+            except ValueError:  # more digits than int() will convert
+                self._content_length = None
+        return self._content_length
     
     @property
     def host(self) -> str:
@@ -136,49 +236,97 @@ class Request:
         """
         Read and return the request body.
         
+        The body is cached on the request and on the scope, so every
+        ``Request`` built over the same scope sees it.
+        
         Raises:
             PayloadTooLarge: If body exceeds max_body_size.
         """
         if self._body is not None:
             return self._body
         
+        cached = self._scope.get(_BODY_KEY)
+        if cached is not None:
+            self._body = cached
+            return cached
+        
         if self._body_consumed:
             return b""
         
-        from thor.exceptions import PayloadTooLarge
+        self._check_content_length()
         
-        # Early rejection via Content-Length header
-        if (
-            self._max_body_size > 0
-            and self.content_length is not None
-            and self.content_length > self._max_body_size
-        ):
-            raise PayloadTooLarge(
-                f"Request body too large. "
-                f"Maximum allowed: {self._max_body_size} bytes"
-            )
+        # Most bodies arrive in a single message: keep its bytes as-is,
+        # with no chunk list and no join
+        message = await self._receive_limited()
+        body = message.get("body", b"")
+        if message.get("more_body", False):
+            chunks: list[bytes] = [body]
+            while True:
+                message = await self._receive_limited()
+                chunk = message.get("body", b"")
+                if chunk:
+                    chunks.append(chunk)
+                
+                if not message.get("more_body", False):
+                    break
+            # join sizes the result once and copies each chunk once
+            body = b"".join(chunks)
         
-        chunks: list[bytes] = []
-        total_size = 0
+        self._body = self._scope[_BODY_KEY] = body
+        self._body_consumed = True
+        return self._body
+    
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Yield the request body chunk by chunk as it arrives.
+        
+        Chunks are never joined, so consumers that do not need the body
+        in one piece (hashing, writing to disk, proxying) handle large
+        bodies without a full-size copy. A body that was already read is
+        yielded as one chunk; once streamed, :meth:`body` returns ``b""``.
         
-        while True:
-            message = await self._receive()
-            body = message.get("body", b"")
+        Raises:
+            PayloadTooLarge: If body exceeds max_body_size.
+        """
+        body = self._body if self._body is not None else self._scope.get(_BODY_KEY)
+        if body is not None:
             if body:
-                total_size += len(body)
-                if self._max_body_size > 0 and total_size > self._max_body_size:
-                    raise PayloadTooLarge(
-                        f"Request body too large. "
-                        f"Maximum allowed: {self._max_body_size} bytes"
-                    )
-                chunks.append(body)
-            
-            if not message.get("more_body", False):
-                break
+                yield body
+            return
+        if self._body_consumed:
+            return
         
-        self._body = b"".join(chunks)
+        self._check_content_length()
         self._body_consumed = True
-        return self._body
+        more_body = True
+        while more_body:
+            message = await self._receive_limited()
+            chunk = message.get("body", b"")
+            if chunk:
+                yield chunk
+            more_body = message.get("more_body", False)
+    
+    def _check_content_length(self) -> None:
+        """Reject early when the declared Content-Length is over the limit."""
+        if self._max_body_size <= 0:
+            return
+        content_length = self.content_length
+        if content_length is not None and content_length > self._max_body_size:
+            raise PayloadTooLarge(
+                f"Request body too large. "
+                f"Maximum allowed: {self._max_body_size} bytes"
+            )
+    
+    async def _receive_limited(self) -> Message:
+        """Receive one message, enforcing ``max_body_size`` on the running total."""
+        message = await self._receive()
+        self._bytes_received += len(message.get("body", b""))
+        if self._max_body_size > 0 and self._bytes_received > self._max_body_size:
+            raise PayloadTooLarge(
+                f"Request body too large. "
+                f"Maximum allowed: {self._max_body_size} bytes"
+            )
+        return message
     
     async def text(self) -> str:
         """Read body as text."""
@@ -186,9 +334,21 @@ class Request:
         return body.decode("utf-8")
     
     async def json(self) -> Any:
-        """Parse body as JSON."""
-        text = await self.text()
-        return json.loads(text) if text else None
+        """
+        Parse body as JSON.
+        
+        The body bytes go straight to the parser (``orjson`` when
+        installed), without first being decoded to a ``str``.
+        """
+        body = await self.body()
+        if not body:
+            return None
+        if orjson is not None:
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass  # e.g. NaN literals — let json accept or reject it
+        return json.loads(body)
     
     async def form(self) -> Mapping[str, str | list[str]]:
         """Parse body as form data (URL-encoded or multipart)."""
@@ -196,54 +356,53 @@ class Request:
             fields, _files = await self.multipart()
             return fields
 
-        body = await self.text()
-        parsed = parse_qs(body, keep_blank_values=True)
-
-        result: dict[str, str | list[str]] = {}
-        for key, values in parsed.items():
-            if len(values) == 1:
-                result[key] = values[0]
-            else:
-                result[key] = values
-
-        return result
+        return _parse_urlencoded(await self.text())
 
     async def multipart(
         self,
-    # pyrefly: ignore [unknown-name]
-    ) -> tuple[Mapping[str, str | list[str]], list["UploadFile"]]:
+    ) -> tuple[Mapping[str, str | list[str]], list[UploadFile]]:
         """
         Parse a ``multipart/form-data`` body.
 
         Returns ``(form_fields, files)`` where *files* is a list of
         :class:`~thor.multipart.UploadFile` instances.
-        """
-        from thor.multipart import UploadFile, parse_multipart
 
-        raw_body = await self.body()
+        If the body has not been read yet it is parsed straight off the
+        ``receive`` channel, so uploads are spooled without the whole
+        body ever being buffered; :meth:`body` is empty afterwards. The
+        result is cached, so later calls return the same uploads.
+        """
+        if self._multipart is not None:
+            return self._multipart
         boundary = self._extract_boundary()
         if boundary is None:
             return {}, []
-        return parse_multipart(raw_body, boundary)
+        if self._body is None and not self._body_consumed and _BODY_KEY not in self._scope:
+            self._check_content_length()
+            self._body_consumed = True
+            self._multipart = await parse_multipart_stream(self._receive_limited, boundary)
+        else:
+            self._multipart = parse_multipart(await self.body(), boundary)
+        return self._multipart
 
     def _extract_boundary(self) -> str | None:
         """Extract the multipart boundary from the Content-Type header."""
-        ct = self.content_type
-        for part in ct.split(";"):
-            part = part.strip()
-            if part.lower().startswith("boundary="):
-                return part.split("=", 1)[1].strip('"')
-        return None
+        return _parse_boundary(self.content_type)
 
-    # pyrefly: ignore [unknown-name]
-    async def files(self) -> list["UploadFile"]:
+    async def files(self) -> list[UploadFile]:
         """Convenience: return only the file uploads from a multipart body."""
         _fields, file_list = await self.multipart()
         return file_list
     
     def get_header(self, name: str, default: str | None = None) -> str | None:
         """Get a specific header value."""
-        return self.headers.get(name.lower(), default)
+        headers = self.headers
+        # Names are stored lower-cased and callers nearly always pass
+        # them that way, so try the name as given before lower()
+        value = headers.get(name)
+        if value is not None:
+            return value
+        return headers.get(name.lower(), default)
     
     def get_query(self, name: str, default: str | None = None) -> str | None:
         """Get a specific query parameter."""
@@ -252,6 +411,59 @@ class Request:
             return value[0] if value else default
         return value
     
+    def get_query_int(self, name: str, default: int = 0) -> int:
+        """
+        Get a query parameter as an ``int``.
+        
+        Returns *default* when the parameter is missing or empty.
+        
+        Raises:
+            BadRequest: If the value is not a valid integer.
+        """
+        value = self.get_query(name)
+        if not value:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise BadRequest(f"Query parameter '{name}' must be an integer") from None
+    
     def get_cookie(self, name: str, default: str | None = None) -> str | None:
         """Get a specific cookie value."""
         return self.cookies.get(name, default)
+
+
+def _parse_urlencoded(data: str) -> dict[str, str | list[str]]:
+    """
+    Parse ``key=value&...`` data, collecting repeated keys into a list.
+    
+    Same result as ``parse_qs(data, keep_blank_values=True)`` with
+    single values unwrapped. Data with nothing to unquote (most query
+    strings) is split in one pass; the rest goes through ``parse_qsl``,
+    whose pairs are collapsed directly instead of via parse_qs's
+    dict of lists.
+    """
+    if "%" not in data and "+" not in data:
+        pairs = [pair.partition("=")[::2] for pair in data.split("&") if pair]
+    else:
+        pairs = parse_qsl(data, keep_blank_values=True)
+    
+    result: dict[str, str | list[str]] = {}
+    for key, value in pairs:
+        existing = result.get(key)
+        if existing is None:
+            result[key] = value
+        elif isinstance(existing, list):
+            existing.append(value)
+        else:
+            result[key] = [existing, value]
+    return result
+
+
+@lru_cache(maxsize=256)
+def _parse_boundary(content_type: str) -> str | None:
+    """Return the ``boundary`` parameter of *content_type*, if any."""
+    match = _BOUNDARY_RE.search(content_type)
+    if match is None:
+        return None
+    return match.group(1) if match.group(1) is not None else match.group(2)
@@ -3,12 +3,108 @@ Response handling for Thor framework.
 Implements various response types following Open/Closed Principle.
 """
 
+import asyncio
+import dataclasses
+import datetime
+import enum
+import functools
 import json
+import math
+import os
+import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from thor.cookies import CookieOptions, format_set_cookie
-from thor.types import Send
+from thor.types import Scope, Send
+
+try:
+    import orjson
+except ImportError:  # optional speedup — install with ``thor[fast]``
+    orjson = None
+
+# Datetimes and dataclasses go through _json_default, as on the stdlib path
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Serialize values beyond plain JSON types.
+    
+    Shared by the ``orjson`` and stdlib paths (``orjson`` passes
+    datetimes and dataclasses through to here) so a payload encodes the
+    same way whether or not the extra is installed.
+    """
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether *obj* contains a NaN or infinite float anywhere."""
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif dataclasses.is_dataclass(item) and not isinstance(item, type):
+            stack.extend(getattr(item, f.name) for f in dataclasses.fields(item))
+    return False
+
+
+# Status codes that must not carry a Content-Length header (RFC 9110 §8.6)
+_NO_BODY_STATUS: frozenset[int] = frozenset({100, 101, 102, 103, 204, 304})
+
+
+def _full_content_type(media_type: str, charset: str) -> str:
+    """Media type with a charset parameter for textual types."""
+    if media_type.startswith("text/") or "json" in media_type:
+        return f"{media_type}; charset={charset}"
+    return media_type
+
+
+@functools.lru_cache(maxsize=64)
+def _content_type_header(media_type: str, charset: str) -> tuple[bytes, bytes]:
+    """Encoded ``content-type`` pair, built once per media type."""
+    return (b"content-type", _full_content_type(media_type, charset).encode("latin-1"))
+
+
+@functools.lru_cache(maxsize=256)
+def _header_name(name: str) -> bytes:
+    """Lower-cased, encoded header name; apps reuse a small set of names."""
+    return name.lower().encode("latin-1")
+
+
+def _open_sequential(path: str) -> int:
+    """
+    Open *path* for reading as a raw descriptor.
+    
+    ``os.read`` on the descriptor skips the buffered-IO layer (and its
+    extra copy), and the kernel is told the file will be read front to
+    back so it can read ahead more aggressively.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return fd
 
 
 class Response(ABC):
@@ -21,6 +117,21 @@ class Response(ABC):
     
     media_type: str = "text/plain"
     charset: str = "utf-8"
+    # Pre-encoded headers added with extend_raw_headers()
+    _raw_extra: tuple[tuple[bytes, bytes], ...] = ()
+    # Encoded content-type pair for the class's media_type and charset,
+    # set per subclass; None when the subclass computes content_type
+    _content_type_pair: tuple[bytes, bytes] | None = None
+    # Subclasses whose __call__ also takes the request scope (to use
+    # server extensions) set this; others are called as response(send)
+    needs_scope: bool = False
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.content_type is Response.content_type:
+            cls._content_type_pair = _content_type_header(cls.media_type, cls.charset)
+        else:
+            cls._content_type_pair = None
     
     def __init__(
         self,
@@ -30,26 +141,48 @@ class Response(ABC):
     ) -> None:
         self.status_code = status_code
         self._headers: dict[str, str] = headers or {}
-        self._cookies: list[str] = []
+        # Encoded set-cookie header pairs, ready to send
+        self._cookies: list[tuple[bytes, bytes]] = []
         self._content = content
+        self._body: bytes | None = None
     
     @property
     def content_type(self) -> str:
         """Full content type with charset."""
-        if self.media_type.startswith("text/") or "json" in self.media_type:
-            return f"{self.media_type}; charset={self.charset}"
-        return self.media_type
+        return _full_content_type(self.media_type, self.charset)
     
     @abstractmethod
     def render(self) -> bytes:
         """Render the response body. Must be implemented by subclasses."""
         ...
     
+    @property
+    def body(self) -> bytes:
+        """
+        The rendered body, encoded once and cached.
+        
+        Both the ``content-length`` header and the body message use
+        this same bytes object, so the payload is never re-encoded
+        or copied between sizing and sending.
+        """
+        if self._body is None:
+            self._body = self.render()
+        return self._body
+    
     def set_header(self, name: str, value: str) -> "Response":
         """Set a response header. Returns self for chaining."""
         self._headers[name] = value
         return self
     
+    def extend_raw_headers(self, headers: Iterable[tuple[bytes, bytes]]) -> "Response":
+        """
+        Append already-encoded ``(name, value)`` header pairs.
+        
+        Names must be lower-case bytes. Returns self for chaining.
+        """
+        self._raw_extra = (*self._raw_extra, *headers)
+        return self
+    
     def set_cookie(
         self,
         name: str,
@@ -57,8 +190,10 @@ class Response(ABC):
         options: CookieOptions | None = None,
     ) -> "Response":
         """Set a cookie. Returns self for chaining."""
+        # Formatted and encoded here, in one go: a bad value fails at the
+        # call site, and _build_headers only has to copy the pair
         cookie = format_set_cookie(name, value, options)
-        self._cookies.append(cookie)
+        self._cookies.append((b"set-cookie", cookie.encode("latin-1")))
         return self
     
     def delete_cookie(
@@ -77,35 +212,69 @@ class Response(ABC):
         return self.set_cookie(name, "", options)
     
     def _build_headers(self) -> list[tuple[bytes, bytes]]:
-        """Build header list for ASGI response."""
-        headers: list[tuple[bytes, bytes]] = []
+        """
+        Build header list for ASGI response.
         
-        # Add content-type
-        headers.append((b"content-type", self.content_type.encode("latin-1")))
+        Most responses carry only a content-type, so each further group
+        is added by one comprehension and skipped outright when empty.
+        """
+        # Add content-type — the class's own pair unless this instance
+        # changed media_type / charset or the subclass computes its own
+        cls = type(self)
+        pair = cls._content_type_pair
+        if pair is not None and self.media_type is cls.media_type and self.charset is cls.charset:
+            headers = [pair]
+        elif cls.content_type is Response.content_type:
+            headers = [_content_type_header(self.media_type, self.charset)]
+        else:
+            headers = [(b"content-type", self.content_type.encode("latin-1"))]
         
         # Add custom headers
-        for name, value in self._headers.items():
-            headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+        if self._headers:
+            headers += [
+                (_header_name(name), value.encode("latin-1"))
+                for name, value in self._headers.items()
+            ]
+        if self._raw_extra:
+            headers += self._raw_extra
         
         # Add cookies
-        for cookie in self._cookies:
-            headers.append((b"set-cookie", cookie.encode("latin-1")))
+        if self._cookies:
+            headers += self._cookies
         
         return headers
     
+    def _build_sized_headers(self, body: bytes) -> list[tuple[bytes, bytes]]:
+        """Build headers plus ``content-length`` for a fully rendered body."""
+        headers = self._build_headers()
+        if (
+            self.status_code not in _NO_BODY_STATUS
+            and not any(name.lower() == "content-length" for name in self._headers)
+            and not any(name == b"content-length" for name, _ in self._raw_extra)
+        ):
+            headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        return headers
+    
     async def __call__(self, send: Send) -> None:
-        """Send the response via ASGI."""
-        body = self.render()
+        """
+        Send the response via ASGI.
+        
+        The whole body goes out in a single ``http.response.body``
+        message with an explicit ``content-length``, so the server can
+        write it in one go instead of falling back to chunked encoding.
+        """
+        body = self.body
         
         await send({
             "type": "http.response.start",
             "status": self.status_code,
-            "headers": self._build_headers(),
+            "headers": self._build_sized_headers(body),
         })
         
         await send({
             "type": "http.response.body",
             "body": body,
+            "more_body": False,
         })
 
 
@@ -136,7 +305,14 @@ class HTMLResponse(Response):
 
 
 class JSONResponse(Response):
-    """JSON response with automatic serialization."""
+    """
+    JSON response with automatic serialization.
+    
+    Uses ``orjson`` when it is installed (compact output only) and
+    falls back to the standard library for indented output or values
+    ``orjson`` cannot encode. Both paths accept the same values and
+    reject NaN/Infinity with ``ValueError``.
+    """
     
     media_type = "application/json"
     
@@ -153,15 +329,86 @@ class JSONResponse(Response):
     def render(self) -> bytes:
         if self._content is None:
             return b"null"
+        if orjson is not None and self._indent is None:
+            try:
+                body = orjson.dumps(
+                    self._content,
+                    default=_json_default,
+                    option=_ORJSON_OPTIONS,
+                )
+            except TypeError:
+                pass  # e.g. integers beyond 64 bits — let json handle it
+            else:
+                # orjson writes non-finite floats as null; json raises for them
+                if b"null" not in body or not _has_non_finite(self._content):
+                    return body
         return json.dumps(
             self._content,
             ensure_ascii=False,
             allow_nan=False,
+            default=_json_default,
             indent=self._indent,
             separators=(",", ":") if self._indent is None else None,
         ).encode(self.charset)
 
 
+class StaticResponse(Response):
+    """
+    Response with a pre-encoded body for constant-content endpoints.
+    
+    The body bytes and the ASGI header list are built once and reused
+    for every request; each send still gets fresh message dicts since
+    middleware may rewrite ``message["headers"]`` in place.
+    """
+    
+    def __init__(
+        self,
+        body: bytes,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str = "application/json",
+    ) -> None:
+        super().__init__(body, status_code, headers)
+        self.media_type = media_type
+        self._raw_headers: list[tuple[bytes, bytes]] | None = None
+    
+    def render(self) -> bytes:
+        return self._content
+    
+    def set_header(self, name: str, value: str) -> "Response":
+        self._raw_headers = None
+        return super().set_header(name, value)
+    
+    def extend_raw_headers(self, headers: Iterable[tuple[bytes, bytes]]) -> "Response":
+        self._raw_headers = None
+        return super().extend_raw_headers(headers)
+    
+    def set_cookie(
+        self,
+        name: str,
+        value: str,
+        options: CookieOptions | None = None,
+    ) -> "Response":
+        self._raw_headers = None
+        return super().set_cookie(name, value, options)
+    
+    async def __call__(self, send: Send) -> None:
+        """Send the cached body and headers via ASGI."""
+        if self._raw_headers is None:
+            self._raw_headers = self._build_sized_headers(self._content)
+        
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": list(self._raw_headers),
+        })
+        await send({
+            "type": "http.response.body",
+            "body": self._content,
+            "more_body": False,
+        })
+
+
 class RedirectResponse(Response):
     """HTTP redirect response."""
     
@@ -207,9 +454,13 @@ class StreamingResponse(Response):
             "headers": self._build_headers(),
         })
         
+        # str.encode is the fastest route from text to bytes (the codecs
+        # module functions are slower); each chunk needs its own bytes
+        # object, as the server may still hold the previous one
+        charset = self.charset
         async for chunk in self._iterator:
             if isinstance(chunk, str):
-                chunk = chunk.encode(self.charset)
+                chunk = chunk.encode(charset)
             await send({
                 "type": "http.response.body",
                 "body": chunk,
@@ -234,6 +485,8 @@ class FileResponse(Response):
     
     # Default chunk size: 64 KB
     CHUNK_SIZE: int = 65_536
+    # Checks the scope for the pathsend extension
+    needs_scope = True
     
     def __init__(
         self,
@@ -245,8 +498,6 @@ class FileResponse(Response):
         base_directory: str | None = None,
         chunk_size: int = CHUNK_SIZE,
     ) -> None:
-        import os
-        
         super().__init__(None, status_code, headers)
         
         # Resolve to an absolute, symlink-free path
@@ -279,17 +530,30 @@ class FileResponse(Response):
         # Not used — streaming is handled by __call__
         return b""
     
-    async def __call__(self, send: Send) -> None:
-        """Stream the file via ASGI in chunks."""
+    async def __call__(self, send: Send, scope: Scope | None = None) -> None:
+        """
+        Send the file via ASGI.
+        
+        If *scope* shows the server supports the ``http.response.pathsend``
+        extension, the server is handed the path and transmits the file
+        itself (typically zero-copy with ``sendfile(2)``). Otherwise the
+        file is streamed in chunks read in a worker thread, so disk I/O
+        never blocks the event loop.
+        """
         await send({
             "type": "http.response.start",
             "status": self.status_code,
             "headers": self._build_headers(),
         })
         
-        with open(self._path, "rb") as f:
+        if scope is not None and "http.response.pathsend" in (scope.get("extensions") or {}):
+            await send({"type": "http.response.pathsend", "path": self._path})
+            return
+        
+        fd = await asyncio.to_thread(_open_sequential, self._path)
+        try:
             while True:
-                chunk = f.read(self._chunk_size)
+                chunk = await asyncio.to_thread(os.read, fd, self._chunk_size)
                 if not chunk:
                     break
                 await send({
@@ -297,6 +561,8 @@ class FileResponse(Response):
                     "body": chunk,
                     "more_body": True,
                 })
+        finally:
+            os.close(fd)
         
         await send({
             "type": "http.response.body",
@@ -6,10 +6,12 @@ Uses a radix tree (compact trie) for O(path-length) route lookup
 instead of linear scanning through all registered routes.
 """
 
+import functools
 import re
+import sys
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Any, Optional, Match, AnyStr, Pattern
+from typing import Any, Pattern
 
 from thor.exceptions import MethodNotAllowed, NotFound, RoutingError
 from thor.types import RouteHandler
@@ -27,6 +29,28 @@ TYPE_PATTERNS: dict[str, str] = {
     "slug": r"[a-z0-9]+(?:-[a-z0-9]+)*",
 }
 
+# Canonical (interned) method names, so dispatch dict lookups
+# hit the identity fast path instead of comparing characters
+HTTP_METHODS: dict[str, str] = {
+    m: sys.intern(m)
+    for m in ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "WEBSOCKET")
+}
+
+
+def normalize_method(method: str) -> str:
+    """Return the interned, upper-cased form of an HTTP method."""
+    interned = HTTP_METHODS.get(method)
+    if interned is None:
+        interned = sys.intern(method.upper())
+    return interned
+
+
+# Dynamic (path, method) lookups whose result each tree remembers
+_MATCH_CACHE_SIZE: int = 1024
+
+# Distinct path templates whose compiled form is remembered
+_ROUTE_PATTERN_CACHE_SIZE: int = 1024
+
 # Type converters
 TYPE_CONVERTERS: dict[str, Callable[[str], Any]] = {
     "int": int,
@@ -37,6 +61,14 @@ TYPE_CONVERTERS: dict[str, Callable[[str], Any]] = {
 }
 
 
+# Compiled patterns for matching a single path segment against a
+# parameter type. ``str`` is absent: a non-empty segment never holds
+# a "/", so it always matches.
+_SEGMENT_TYPE_RES: dict[str, Pattern[str]] = {
+    name: re.compile(pattern) for name, pattern in TYPE_PATTERNS.items() if name != "str"
+}
+
+
 @dataclass(slots=True)
 class Route:
     """
@@ -47,33 +79,31 @@ class Route:
     
     path: str
     handler: RouteHandler
-    methods: set[str] = field(default_factory=lambda: {"GET"})
+    # Interned, upper-cased method names (normalised in __post_init__)
+    methods: frozenset[str] = frozenset({"GET"})
     name: str | None = None
     _pattern: re.Pattern[str] | None = field(default=None, init=False, repr=False)
     _param_types: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    _param_patterns: dict[str, re.Pattern[str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _converters: dict[str, Callable[[str], Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
     
     def __post_init__(self) -> None:
-        """Compile the route pattern."""
+        """Normalise the methods and compile the route pattern."""
+        self.methods = frozenset(normalize_method(m) for m in self.methods)
         self._compile_pattern()
     
     def _compile_pattern(self) -> None:
-        """Convert path pattern to regex."""
-        pattern = self.path
-        self._param_types = {}
-        
-        def replace_param(match: re.Match[str]) -> str:
-            param_name = match.group(1)
-            param_type = match.group(2) or "str"
-            
-            if param_type not in TYPE_PATTERNS:
-                raise RoutingError(f"Unknown parameter type: {param_type}")
-            
-            self._param_types[param_name] = param_type
-            return f"(?P<{param_name}>{TYPE_PATTERNS[param_type]})"
-        
-        regex_pattern = PATH_PARAM_PATTERN.sub(replace_param, pattern)
-        regex_pattern = f"^{regex_pattern}$"
-        self._pattern = re.compile(regex_pattern)
+        """Convert path pattern to regex (shared by Routes with the same path)."""
+        (
+            self._pattern,
+            self._param_types,
+            self._param_patterns,
+            self._converters,
+        ) = _compile_path(self.path)
     
     def match(self, path: str) -> dict[str, Any] | None:
         """
@@ -88,16 +118,60 @@ class Route:
             return None
         
         params: dict[str, Any] = {}
+        converters = self._converters
         for name, value in match.groupdict().items():
-            param_type = self._param_types.get(name, "str")
-            converter = TYPE_CONVERTERS.get(param_type, str)
             try:
-                params[name] = converter(value)
+                params[name] = converters[name](value)
             except (ValueError, TypeError):
                 return None
         
         return params
 
+    def build_path(self, **path_params: Any) -> str:
+        """Substitute *path_params* into this route's path template."""
+        path = self.path
+        for param, value in path_params.items():
+            pattern = self._param_patterns.get(param)
+            if pattern is not None:
+                # Escape backslashes so re.sub inserts the value literally
+                path = pattern.sub(str(value).replace("\\", r"\\"), path)
+        return path
+
+
+@functools.lru_cache(maxsize=_ROUTE_PATTERN_CACHE_SIZE)
+def _compile_path(path: str) -> tuple[
+    re.Pattern[str],
+    dict[str, str],
+    dict[str, re.Pattern[str]],
+    dict[str, Callable[[str], Any]],
+]:
+    """
+    Compile a path template into its regex and per-parameter tables.
+    
+    Memoised on the template: a subrouter's routes are copied under each
+    prefix they are included with, and identical templates compile
+    identically. Callers must not mutate the returned dicts.
+    """
+    param_types: dict[str, str] = {}
+    param_patterns: dict[str, re.Pattern[str]] = {}
+    converters: dict[str, Callable[[str], Any]] = {}
+    
+    def replace_param(match: re.Match[str]) -> str:
+        param_name = match.group(1)
+        param_type = match.group(2) or "str"
+        
+        if param_type not in TYPE_PATTERNS:
+            raise RoutingError(f"Unknown parameter type: {param_type}")
+        
+        param_types[param_name] = param_type
+        converters[param_name] = TYPE_CONVERTERS[param_type]
+        # Used by url_for to substitute values back into the path
+        param_patterns[param_name] = re.compile(re.escape(match.group(0)))
+        return f"(?P<{param_name}>{TYPE_PATTERNS[param_type]})"
+    
+    regex_pattern = PATH_PARAM_PATTERN.sub(replace_param, path)
+    return re.compile(f"^{regex_pattern}$"), param_types, param_patterns, converters
+
 
 # ---------------------------------------------------------------------------
 # Radix tree for O(path-length) route resolution
@@ -107,16 +181,43 @@ class Route:
 class _RadixNode:
     """A single node in the radix tree."""
 
-    __slots__ = ("segment", "children", "param_child", "routes")
+    __slots__ = (
+        "segment",
+        "children",
+        "param_child",
+        "wildcard_child",
+        "routes",
+        "methods",
+        "param_name",
+        "type_re",
+        "converter",
+    )
 
     def __init__(self, segment: str = "") -> None:
         self.segment: str = segment
-        # Static children keyed by the first character of their segment
+        # Static children keyed by their full segment text
         self.children: dict[str, "_RadixNode"] = {}
         # At most one parametric child (covers {param} / {param:type})
         self.param_child: "_RadixNode | None" = None
+        # At most one catch-all child (covers a trailing {param:path})
+        self.wildcard_child: "_RadixNode | None" = None
         # Routes that terminate at this node (may have different methods)
         self.routes: list[Route] = []
+        # Interned method -> terminal route, for direct dispatch
+        self.methods: dict[str, Route] = {}
+        # For parametric / catch-all nodes: resolved and compiled once
+        # from the ``{name:type}`` template so lookups never re-parse it.
+        # None when any segment matches (a plain ``str`` parameter).
+        self.param_name: str = ""
+        self.type_re: Pattern[str] | None = None
+        self.converter: Callable[[str], Any] = str
+        m = PATH_PARAM_PATTERN.fullmatch(segment)
+        if m:
+            param_type = m.group(2) or "str"
+            self.param_name = m.group(1)
+            self.converter = TYPE_CONVERTERS.get(param_type, str)
+            if param_type in _SEGMENT_TYPE_RES:
+                self.type_re = _SEGMENT_TYPE_RES[param_type]
 
 
 class RadixTree:
@@ -126,6 +227,20 @@ class RadixTree:
     Static path segments are resolved via dictionary lookup.
     Parametric segments (``{name}`` / ``{name:type}``) are stored as
     a single child per node and matched via regex at lookup time.
+    A trailing ``{name:path}`` segment becomes a catch-all child that
+    consumes the remainder of the path.
+
+    Patterns the tree cannot represent segment-by-segment (e.g.
+    ``/files/{name}.txt`` or a ``path`` parameter followed by more
+    segments) are kept in a small fallback list and matched with the
+    route's own regex.
+
+    Precedence per segment: static, then parametric, then catch-all.
+
+    Fully static routes are also indexed by their exact path, so a
+    request for one is resolved with a single dict lookup before the
+    tree is walked. Successful walks are memoised per ``(path, method)``
+    in a bounded LRU cache, cleared whenever a route is inserted.
 
     Complexity: O(number-of-segments) per lookup instead of
     O(total-routes).
@@ -133,6 +248,13 @@ class RadixTree:
 
     def __init__(self) -> None:
         self._root = _RadixNode()
+        self._fallback: list[Route] = []
+        # Exact path of a fully static route -> its terminal node
+        self._static: dict[str, _RadixNode] = {}
+        # (path, method) -> (route, params) for dynamic paths. Misses
+        # raise, and exceptions are never cached, so probing for
+        # unknown paths cannot fill it.
+        self._cached_walk = functools.lru_cache(maxsize=_MATCH_CACHE_SIZE)(self._walk)
 
     # ------------------------------------------------------------------
     # Insertion
@@ -140,11 +262,20 @@ class RadixTree:
 
     def insert(self, route: Route) -> None:
         """Insert a route into the tree."""
+        self._cached_walk.cache_clear()
         segments = self._split(route.path)
+        if not self._is_tree_compatible(segments):
+            self._fallback.append(route)
+            return
+
         node = self._root
 
         for seg in segments:
-            if self._is_param(seg):
+            if self._is_wildcard(seg):
+                if node.wildcard_child is None:
+                    node.wildcard_child = _RadixNode(seg)
+                node = node.wildcard_child
+            elif self._is_param(seg):
                 if node.param_child is None:
                     node.param_child = _RadixNode(seg)
                 node = node.param_child
@@ -154,6 +285,11 @@ class RadixTree:
                 node = node.children[seg]
 
         node.routes.append(route)
+        for method in route.methods:
+            # First registration wins, as with a linear scan of ``routes``
+            node.methods.setdefault(normalize_method(method), route)
+        if "{" not in route.path:
+            self._static[route.path] = node
 
     # ------------------------------------------------------------------
     # Lookup
@@ -166,8 +302,69 @@ class RadixTree:
         Returns ``(route, params)`` on success.
         Raises ``NotFound`` or ``MethodNotAllowed``.
         """
+        # A static route matching the path exactly wins over anything
+        # the walk could find, so it can be answered without walking
+        static = self._static.get(path)
+        if static is not None:
+            route = static.methods.get(method)
+            if route is not None:
+                return route, {}
+
+        route, params = self._cached_walk(path, method)
+        # Handlers receive their own dict, so the cached one stays intact
+        return route, dict(params)
+
+    def _walk(self, path: str, method: str) -> tuple[Route, dict[str, Any]]:
+        """
+        Walk the tree for *path* and *method*.
+        
+        The first branch a full search would explore — static child,
+        else parametric, else catch-all, at every segment — is followed
+        in a plain loop with no stack. It is the answer whenever it ends
+        at a route for *method*; anything else (a dead end, a method
+        mismatch) goes to :meth:`_search`, which backtracks.
+        """
         segments = self._split(path)
-        # (node, segment_index, accumulated_params)
+        node: _RadixNode | None = self._root
+        params: dict[str, Any] = {}
+        for idx, seg_value in enumerate(segments):
+            child = node.children.get(seg_value)
+            if child is not None:
+                node = child
+                continue
+            pnode = node.param_child
+            if pnode is not None and (pnode.type_re is None or pnode.type_re.fullmatch(seg_value)):
+                try:
+                    params[pnode.param_name] = pnode.converter(seg_value)
+                except (ValueError, TypeError):
+                    pass
+                else:
+                    node = pnode
+                    continue
+            wnode = node.wildcard_child
+            if wnode is not None:
+                params[wnode.param_name] = "/".join(segments[idx:])
+                node = wnode
+            else:
+                node = None
+            break
+        if node is not None:
+            route = node.methods.get(method)
+            if route is not None:
+                return route, params
+        return self._search(path, segments, method)
+
+    def _search(
+        self,
+        path: str,
+        segments: list[str],
+        method: str,
+    ) -> tuple[Route, dict[str, Any]]:
+        """Search every branch of the tree, then the fallback routes."""
+        # (node, segment_index, accumulated_params). A params dict is
+        # never changed once on the stack — a branch that binds a
+        # parameter copies it first — so static children share their
+        # parent's dict and only parametric branches pay for a copy.
         stack: list[tuple[_RadixNode, int, dict[str, Any]]] = [
             (self._root, 0, {}),
         ]
@@ -179,40 +376,48 @@ class RadixTree:
 
             if idx == len(segments):
                 # We've consumed every segment — check for terminal routes
-                for route in node.routes:
-                    if method in route.methods:
-                        return route, params
-                    method_matched_route = method_matched_route or route
+                route = node.methods.get(method)
+                if route is not None:
+                    return route, params
+                if node.routes:
+                    method_matched_route = method_matched_route or node.routes[0]
                 continue
 
             seg_value = segments[idx]
 
-            # Push param first so static (pushed second) is popped first (LIFO)
-            # 1. Try parametric child
+            # Push in reverse precedence order so the stack pops
+            # static first, then param, then catch-all (LIFO)
+            # 1. Try catch-all child — swallows every remaining segment
+            if node.wildcard_child is not None:
+                wnode = node.wildcard_child
+                new_params = dict(params)
+                new_params[wnode.param_name] = "/".join(segments[idx:])
+                stack.append((wnode, len(segments), new_params))
+
+            # 2. Try parametric child
             if node.param_child is not None:
                 pnode = node.param_child
-                # Extract param name + type from the template segment
-                # pyrefly: ignore [bad-assignment]
-                m: Optional[Match[AnyStr]] = PATH_PARAM_PATTERN.fullmatch(pnode.segment)
-                if m:
-                    pname = m.group(1)
-                    ptype = m.group(2) or "str"
-                    # pyrefly: ignore [no-matching-overload]
-                    type_re = TYPE_PATTERNS.get(ptype, TYPE_PATTERNS["str"])
-                    if re.fullmatch(type_re, seg_value):
-                        # pyrefly: ignore [no-matching-overload]
-                        converter = TYPE_CONVERTERS.get(ptype, str)
-                        try:
-                            new_params = dict(params)
-                            # pyrefly: ignore [unsupported-operation]
-                            new_params[pname] = converter(seg_value)
-                            stack.append((pnode, idx + 1, new_params))
-                        except (ValueError, TypeError):
-                            pass
-
-            # 2. Try static child (pushed after param so it's popped first — LIFO)
-            if seg_value in node.children:
-                stack.append((node.children[seg_value], idx + 1, dict(params)))
+                if pnode.type_re is None or pnode.type_re.fullmatch(seg_value):
+                    try:
+                        new_params = dict(params)
+                        new_params[pnode.param_name] = pnode.converter(seg_value)
+                        stack.append((pnode, idx + 1, new_params))
+                    except (ValueError, TypeError):
+                        pass
+
+            # 3. Try static child (pushed last so it's popped first — LIFO)
+            child = node.children.get(seg_value)
+            if child is not None:
+                stack.append((child, idx + 1, params))
+
+        # Exotic patterns the tree can't index — match by regex
+        for route in self._fallback:
+            fallback_params = route.match(path)
+            if fallback_params is None:
+                continue
+            if method in route.methods:
+                return route, fallback_params
+            method_matched_route = method_matched_route or route
 
         if method_matched_route is not None:
             raise MethodNotAllowed(f"Method {method} not allowed for {path}")
@@ -224,12 +429,41 @@ class RadixTree:
 
     @staticmethod
     def _split(path: str) -> list[str]:
-        """Split a path into non-empty segments."""
-        return [s for s in path.split("/") if s]
+        """
+        Split a path into non-empty segments.
+
+        The common case (no empty segments) stays entirely in C via
+        ``strip`` + ``split``; the filtering comprehension only runs
+        for paths containing ``//``.
+        """
+        stripped = path.strip("/")
+        if not stripped:
+            return []
+        if "//" in stripped:
+            return [s for s in stripped.split("/") if s]
+        return stripped.split("/")
 
     @staticmethod
     def _is_param(segment: str) -> bool:
-        return segment.startswith("{") and segment.endswith("}")
+        return PATH_PARAM_PATTERN.fullmatch(segment) is not None
+
+    @staticmethod
+    def _is_wildcard(segment: str) -> bool:
+        m = PATH_PARAM_PATTERN.fullmatch(segment)
+        return m is not None and m.group(2) == "path"
+
+    @classmethod
+    def _is_tree_compatible(cls, segments: list[str]) -> bool:
+        """Whether every segment is either fully static or fully parametric."""
+        last = len(segments) - 1
+        for i, seg in enumerate(segments):
+            if "{" not in seg:
+                continue
+            if not cls._is_param(seg):
+                return False  # e.g. "{name}.txt" or "v{version:int}"
+            if cls._is_wildcard(seg) and i != last:
+                return False  # catch-all must be the final segment
+        return True
 
 
 class Router:
@@ -243,26 +477,19 @@ class Router:
     def __init__(self, prefix: str = "") -> None:
         self._prefix = prefix.rstrip("/")
         self._routes: list[Route] = []
-        self._subrouters: list[tuple[str, "Router"]] = []
+        # Prefixed copies of included routers' routes, made once at
+        # include time (and as those routers gain routes later)
+        self._included: list[Route] = []
+        # (parent router, full prefix) for every router including this one
+        self._parents: list[tuple["Router", str]] = []
         self._tree: RadixTree = RadixTree()
-        self._tree_dirty: bool = False
+        # name -> Route, built lazily from ``routes`` (first registration wins)
+        self._routes_by_name: dict[str, Route] | None = None
     
     @property
     def routes(self) -> list[Route]:
         """Get all registered routes including subrouter routes."""
-        all_routes: list[Route] = list(self._routes)
-        
-        for prefix, subrouter in self._subrouters:
-            for route in subrouter.routes:
-                full_path = f"{prefix}{route.path}"
-                all_routes.append(Route(
-                    path=full_path,
-                    handler=route.handler,
-                    methods=route.methods,
-                    name=route.name,
-                ))
-        
-        return all_routes
+        return [*self._routes, *self._included]
     
     def add_route(
         self,
@@ -273,7 +500,7 @@ class Router:
     ) -> Route:
         """Add a route to the router."""
         full_path = f"{self._prefix}{path}" if self._prefix else path
-        methods_set = set(m.upper() for m in (methods or ["GET"]))
+        methods_set = frozenset(normalize_method(m) for m in (methods or ["GET"]))
         
         route = Route(
             path=full_path,
@@ -282,23 +509,49 @@ class Router:
             name=name,
         )
         self._routes.append(route)
-        self._tree.insert(route)
-        self._tree_dirty = False  # Inserted directly — tree is up to date
+        self._register(route)
         return route
     
     def include_router(self, router: "Router", prefix: str = "") -> None:
-        """Include another router with an optional prefix."""
+        """
+        Include another router with an optional prefix.
+        
+        Its routes are copied under the prefix and inserted into this
+        router's tree right away; routes added to *router* afterwards
+        are passed up the same way.
+        """
         full_prefix = f"{self._prefix}{prefix}"
-        self._subrouters.append((full_prefix, router))
-        self._tree_dirty = True
-
-    def _rebuild_tree(self) -> None:
-        """Rebuild the radix tree from the current route list."""
-        tree = RadixTree()
-        for route in self.routes:
-            tree.insert(route)
-        self._tree = tree
-        self._tree_dirty = False
+        router._parents.append((self, full_prefix))
+        for route in router.routes:
+            self._adopt(route, full_prefix)
+    
+    def _register(self, route: Route) -> None:
+        """Index a route in this router and pass it up to including routers."""
+        self._tree.insert(route)
+        self._routes_by_name = None
+        for parent, prefix in self._parents:
+            parent._adopt(route, prefix)
+    
+    def _adopt(self, route: Route, prefix: str) -> None:
+        """Register a copy of an included router's *route* under *prefix*."""
+        copy = Route(
+            path=f"{prefix}{route.path}",
+            handler=route.handler,
+            methods=route.methods,
+            name=route.name,
+        )
+        self._included.append(copy)
+        self._register(copy)
+
+    def get_route(self, name: str) -> Route | None:
+        """Look up a named route, including routes from subrouters."""
+        if self._routes_by_name is None:
+            index: dict[str, Route] = {}
+            for route in self.routes:
+                if route.name is not None:
+                    index.setdefault(route.name, route)
+            self._routes_by_name = index
+        return self._routes_by_name.get(name)
 
     def match(self, path: str, method: str) -> tuple[Route, dict[str, Any]]:
         """
@@ -307,9 +560,7 @@ class Router:
         Uses the radix tree for O(path-length) lookup.
         Raises NotFound or MethodNotAllowed if no match.
         """
-        if self._tree_dirty:
-            self._rebuild_tree()
-        return self._tree.search(path, method.upper())
+        return self._tree.search(path, normalize_method(method))
     
     # Decorator shortcuts
     def get(
@@ -394,12 +645,11 @@ class Router:
         route = Route(
             path=full_path,
             handler=handler,
-            methods={"WEBSOCKET"},
+            methods=frozenset({"WEBSOCKET"}),
             name=name,
         )
         self._routes.append(route)
-        self._tree.insert(route)
-        self._tree_dirty = False
+        self._register(route)
         return route
 
     def websocket(
@@ -415,6 +665,4 @@ class Router:
 
     def ws_match(self, path: str) -> tuple[Route, dict[str, Any]]:
         """Find a matching WebSocket route. Raises NotFound."""
-        if self._tree_dirty:
-            self._rebuild_tree()
         return self._tree.search(path, "WEBSOCKET")
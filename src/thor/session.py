@@ -4,12 +4,17 @@ Provides server-side session storage with secure cookie tokens.
 """
 
 from typing import Optional
+import json
+import os
+import re
 import secrets
+import tempfile
 import time
 from abc import ABC, abstractmethod
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
 from dataclasses import dataclass, field
-from typing import Any, Iterator
+from types import MappingProxyType
+from typing import Any, Iterator, Self
 
 from thor.cookies import CookieOptions, SecureCookie, format_set_cookie
 from thor.middleware import Middleware
@@ -58,6 +63,27 @@ class Session(MutableMapping[str, Any]):
     def __contains__(self, key: object) -> bool:
         return key in self._session_data.data
     
+    def update(self, other: Any = (), /, **kwargs: Any) -> None:
+        """
+        Bulk update in a single ``dict.update`` call.
+        
+        Overrides the ``MutableMapping`` mixin, which would call
+        ``__setitem__`` once per key.
+        """
+        if not other and not kwargs:
+            return
+        self._session_data.data.update(other, **kwargs)
+        self._session_data.modified = True
+    
+    def __ior__(self, other: Any) -> Self:
+        """``session |= data``, applied through the bulk ``update``."""
+        self.update(other)
+        return self
+    
+    def as_mapping(self) -> Mapping[str, Any]:
+        """Read-only live view of the session data (no copy)."""
+        return MappingProxyType(self._session_data.data)
+    
     @property
     def is_new(self) -> bool:
         """Check if this is a new session."""
@@ -169,7 +195,6 @@ class FileSessionBackend(SessionBackend):
     """
 
     def __init__(self, directory: str = ".thor_sessions") -> None:
-        import os
         self._directory = os.path.abspath(directory)
         os.makedirs(self._directory, exist_ok=True)
 
@@ -178,8 +203,6 @@ class FileSessionBackend(SessionBackend):
     # ------------------------------------------------------------------
 
     def _path_for(self, session_id: str) -> str:
-        import os
-        import re
         # Sanitise session_id to prevent directory traversal
         safe_id = re.sub(r"[^a-zA-Z0-9_\-]", "", session_id)
         if not safe_id:
@@ -188,7 +211,6 @@ class FileSessionBackend(SessionBackend):
 
     @staticmethod
     def _serialise(data: SessionData) -> str:
-        import json
         return json.dumps({
             "data": data.data,
             "created_at": data.created_at,
@@ -197,7 +219,6 @@ class FileSessionBackend(SessionBackend):
 
     @staticmethod
     def _deserialise(raw: str) -> SessionData:
-        import json
         obj = json.loads(raw)
         return SessionData(
             data=obj["data"],
@@ -210,7 +231,6 @@ class FileSessionBackend(SessionBackend):
     # ------------------------------------------------------------------
 
     async def load(self, session_id: str) -> SessionData | None:
-        import os
         path = self._path_for(session_id)
         if not os.path.exists(path):
             return None
@@ -225,8 +245,6 @@ class FileSessionBackend(SessionBackend):
             return None
 
     async def save(self, session_id: str, data: SessionData) -> None:
-        import os
-        import tempfile
         path = self._path_for(session_id)
         # Atomic write: write to temp file in same dir, then rename
         fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
@@ -243,7 +261,6 @@ class FileSessionBackend(SessionBackend):
             raise
 
     async def delete(self, session_id: str) -> None:
-        import os
         path = self._path_for(session_id)
         try:
             os.unlink(path)
@@ -251,7 +268,6 @@ class FileSessionBackend(SessionBackend):
             pass
 
     async def cleanup(self, max_age: int) -> None:
-        import os
         current_time = time.time()
         try:
             entries = os.listdir(self._directory)
@@ -320,7 +336,10 @@ class SessionMiddleware(Middleware):
                     await self.backend.save(session_id, session_data)
                 
                 # Set session cookie
-                headers: list[tuple[bytes, bytes]] = list(message.get("headers", []))
+                # Extend the response's own header list in place
+                headers = message.get("headers")
+                if type(headers) is not list:
+                    headers = message["headers"] = list(headers or ())
                 # pyrefly: ignore [bad-argument-type]
                 signed_id: str = self._secure_cookie.sign(session_id)
                 cookie: str = format_set_cookie(
@@ -329,7 +348,6 @@ class SessionMiddleware(Middleware):
                     self.cookie_options,
                 )
                 headers.append((b"set-cookie", cookie.encode("latin-1")))
-                message["headers"] = headers
             
             await send(message)
         
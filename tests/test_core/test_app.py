@@ -28,17 +28,42 @@ class TestSecretKeyValidation:
 class TestAddMiddlewareGuard:
     def test_session_middleware_without_secret_raises(self) -> None:
         app = Thor()
+        app.add_middleware(SessionMiddleware, secret_key="unused")
         with pytest.raises(RuntimeError, match="secret_key"):
-            app.add_middleware(SessionMiddleware, secret_key="unused")
+            app.finalize()
 
     def test_csrf_middleware_without_secret_raises(self) -> None:
         app = Thor()
+        app.add_middleware(CSRFMiddleware, secret_key="unused")
         with pytest.raises(RuntimeError, match="secret_key"):
-            app.add_middleware(CSRFMiddleware, secret_key="unused")
+            app.finalize()
+
+    def test_all_offending_middleware_listed(self) -> None:
+        app = Thor()
+        app.add_middleware(SessionMiddleware, secret_key="unused")
+        app.add_middleware(CSRFMiddleware, secret_key="unused")
+        with pytest.raises(RuntimeError, match="SessionMiddleware, CSRFMiddleware"):
+            app.finalize()
+
+    async def test_lifespan_startup_fails_without_secret(self) -> None:
+        app = Thor()
+        app.add_middleware(SessionMiddleware, secret_key="unused")
+        sent: list[dict] = []
+
+        async def receive():
+            return {"type": "lifespan.startup"}
+
+        async def send(message):
+            sent.append(message)
+
+        await app({"type": "lifespan"}, receive, send)
+        assert sent[0]["type"] == "lifespan.startup.failed"
+        assert "SessionMiddleware" in sent[0]["message"]
 
     def test_session_middleware_with_secret_ok(self) -> None:
         app = Thor(secret_key="a" * _MIN_SECRET_KEY_LENGTH)
         app.add_middleware(SessionMiddleware, secret_key="a" * 20)
+        app.finalize()
 
 
 class TestRouteRegistration:
@@ -57,6 +82,15 @@ class TestRouteRegistration:
         url = app.url_for("user_detail", id=42)
         assert url == "/users/42"
 
+    def test_url_for_subrouter_route(self) -> None:
+        from thor.routing import Router
+
+        app = Thor()
+        api = Router(prefix="/api")
+        api.add_route("/org/{org}/repo/{repo}", lambda r: None, name="repo")
+        app.include_router(api)
+        assert app.url_for("repo", org="acme", repo="thor") == "/api/org/acme/repo/thor"
+
     def test_url_for_unknown_raises(self) -> None:
         app = Thor()
         with pytest.raises(ValueError, match="No route named"):
@@ -121,3 +155,122 @@ class TestRequestHandling:
         cap = ResponseCapture()
         await app(scope, make_receive(b""), cap)
         assert cap.status == 405
+
+    async def test_str_subclass_response_conversion(self) -> None:
+        class Markup(str):
+            pass
+
+        app = Thor()
+
+        @app.get("/markup")
+        async def handler(request):
+            return Markup("<b>hi</b>")
+
+        scope = make_scope(method="GET", path="/markup")
+        cap = ResponseCapture()
+        await app(scope, make_receive(b""), cap)
+        assert cap.body == b"<b>hi</b>"
+        assert cap.headers["content-type"].startswith("text/plain")
+
+    async def test_response_subclass_with_send_only_call(self) -> None:
+        class Custom(TextResponse):
+            async def __call__(self, send) -> None:
+                await super().__call__(send)
+
+        app = Thor()
+
+        @app.get("/custom")
+        async def custom(request: Request) -> Custom:
+            return Custom("ok")
+
+        cap = ResponseCapture()
+        await app(make_scope(method="GET", path="/custom"), make_receive(b""), cap)
+        assert cap.status == 200
+        assert cap.body == b"ok"
+
+    async def test_file_response_gets_scope_for_pathsend(self, tmp_path) -> None:
+        from thor.response import FileResponse
+
+        target = tmp_path / "a.txt"
+        target.write_bytes(b"hello")
+        app = Thor()
+
+        @app.get("/file")
+        async def file(request: Request) -> FileResponse:
+            return FileResponse(str(target))
+
+        scope = make_scope(path="/file", extras={"extensions": {"http.response.pathsend": {}}})
+        cap = ResponseCapture()
+        await app(scope, make_receive(b""), cap)
+        assert cap.messages[-1]["type"] == "http.response.pathsend"
+
+    async def test_static_route(self) -> None:
+        app = Thor()
+        app.static("/info", {"framework": "Thor"})
+
+        for _ in range(2):
+            cap = ResponseCapture()
+            await app(make_scope(method="GET", path="/info"), make_receive(b""), cap)
+            assert cap.status == 200
+            assert cap.body == b'{"framework":"Thor"}'
+            assert cap.headers["content-type"] == "application/json; charset=utf-8"
+
+    @pytest.mark.parametrize(
+        ("content", "content_type"),
+        [
+            ("User-agent: *", "text/plain; charset=utf-8"),
+            (b"\x89PNG", "application/octet-stream"),
+        ],
+    )
+    async def test_static_media_type_follows_content(self, content, content_type: str) -> None:
+        app = Thor()
+        app.static("/file", content)
+        cap = ResponseCapture()
+        await app(make_scope(method="GET", path="/file"), make_receive(b""), cap)
+        assert cap.headers["content-type"] == content_type
+
+    async def test_static_explicit_media_type(self) -> None:
+        app = Thor()
+        app.static("/robots.txt", "User-agent: *", media_type="text/x-robots")
+        cap = ResponseCapture()
+        await app(make_scope(method="GET", path="/robots.txt"), make_receive(b""), cap)
+        assert cap.headers["content-type"] == "text/x-robots; charset=utf-8"
+
+
+class TestMiddlewareChainCaching:
+    def test_finalize_caches_chain(self) -> None:
+        app = Thor()
+        assert app.finalize() is app.finalize()
+
+    async def test_http_dispatches_to_built_chain(self) -> None:
+        app = Thor()
+        cap = ResponseCapture()
+        await app(make_scope(path="/nope"), make_receive(b""), cap)
+        assert app._dispatchers["http"] is app.finalize()
+
+    async def test_unknown_scope_type_raises(self) -> None:
+        app = Thor()
+        with pytest.raises(RuntimeError, match="scope type"):
+            await app({"type": "mystery"}, make_receive(b""), ResponseCapture())
+
+    def test_add_middleware_invalidates_chain(self) -> None:
+        from thor.middleware import RequestLoggingMiddleware
+
+        app = Thor()
+        first = app.finalize()
+        app.add_middleware(RequestLoggingMiddleware)
+        second = app.finalize()
+        assert second is not first
+        # Folded chain: the entry point is the outermost layer's process()
+        assert isinstance(second.__self__, Middleware)
+
+
+class TestSampleApp:
+    async def test_sample_imports_and_serves_static_routes(self) -> None:
+        import sample
+
+        for path in ("/", "/api/v1/info"):
+            cap = ResponseCapture()
+            await sample.app(make_scope(method="GET", path=path), make_receive(b""), cap)
+            assert cap.status == 200
+            assert cap.headers["content-type"] == "application/json; charset=utf-8"
@@ -60,6 +60,16 @@ class TestRadixTree:
         found, params = tree.search(f"/items/{uid}", "GET")
         assert params["item_id"] == uid
 
+    @pytest.mark.parametrize(
+        ("template", "segment"),
+        [("{id:int}", "4x2"), ("{item_id:uuid}", "not-a-uuid"), ("{name:slug}", "Bad_Slug")],
+    )
+    def test_typed_param_rejects_non_matching_segment(self, template: str, segment: str) -> None:
+        tree = RadixTree()
+        tree.insert(Route(path=f"/things/{template}", handler=_handler, methods={"GET"}))
+        with pytest.raises(NotFound):
+            tree.search(f"/things/{segment}", "GET")
+
     def test_static_preferred_over_param(self) -> None:
         """Static child should be tried alongside parametric child."""
         tree = RadixTree()
@@ -71,6 +81,77 @@ class TestRadixTree:
         assert found is static
         assert params == {}
 
+    def test_split_ignores_empty_segments(self) -> None:
+        assert RadixTree._split("/") == []
+        assert RadixTree._split("/a/b/") == ["a", "b"]
+        assert RadixTree._split("//a//b") == ["a", "b"]
+
+    def test_same_path_dispatches_on_method(self) -> None:
+        tree = RadixTree()
+        get = Route(path="/items", handler=_handler, methods={"GET"})
+        post = Route(path="/items", handler=_handler, methods={"POST"})
+        tree.insert(get)
+        tree.insert(post)
+        assert tree.search("/items", "GET")[0] is get
+        assert tree.search("/items", "POST")[0] is post
+
+
+    def test_static_index_respects_method_and_normalisation(self) -> None:
+        tree = RadixTree()
+        first = Route(path="/items", handler=_handler, methods={"GET"})
+        second = Route(path="/items", handler=_handler, methods={"GET", "POST"})
+        param = Route(path="/{name}", handler=_handler, methods={"DELETE"})
+        for route in (first, second, param):
+            tree.insert(route)
+        assert tree._static["/items"].methods["GET"] is first
+        assert tree.search("/items", "GET") == (first, {})
+        assert tree.search("/items/", "POST") == (second, {})
+        assert tree.search("/items", "DELETE") == (param, {"name": "items"})
+
+    def test_backtracks_when_static_branch_dead_ends(self) -> None:
+        tree = RadixTree()
+        static = Route(path="/users/me/settings", handler=_handler, methods={"GET"})
+        param = Route(path="/users/{id}/posts", handler=_handler, methods={"GET"})
+        tree.insert(static)
+        tree.insert(param)
+        assert tree.search("/users/me/posts", "GET") == (param, {"id": "me"})
+
+    def test_backtracks_when_first_branch_lacks_method(self) -> None:
+        tree = RadixTree()
+        static = Route(path="/users/me", handler=_handler, methods={"GET"})
+        param = Route(path="/users/{id}", handler=_handler, methods={"DELETE"})
+        tree.insert(static)
+        tree.insert(param)
+        assert tree.search("/users/me", "DELETE") == (param, {"id": "me"})
+        with pytest.raises(MethodNotAllowed):
+            tree.search("/users/me", "PUT")
+
+    def test_match_cache_returns_independent_params(self) -> None:
+        tree = RadixTree()
+        route = Route(path="/users/{id:int}", handler=_handler, methods={"GET"})
+        tree.insert(route)
+        first = tree.search("/users/7", "GET")[1]
+        first["id"] = "tampered"
+        assert tree.search("/users/7", "GET") == (route, {"id": 7})
+        assert tree._cached_walk.cache_info().hits == 1
+
+    def test_insert_clears_match_cache(self) -> None:
+        tree = RadixTree()
+        tree.insert(Route(path="/a/{x}", handler=_handler, methods={"GET"}))
+        tree.search("/a/me", "GET")
+        static = Route(path="/a/me", handler=_handler, methods={"GET"})
+        tree.insert(static)
+        assert tree._cached_walk.cache_info().currsize == 0
+        assert tree.search("/a/me/", "GET") == (static, {})
+
+    def test_misses_are_not_cached(self) -> None:
+        tree = RadixTree()
+        tree.insert(Route(path="/a", handler=_handler, methods={"GET"}))
+        for path in ("/b", "/c"):
+            with pytest.raises(NotFound):
+                tree.search(path, "GET")
+        assert tree._cached_walk.cache_info().currsize == 0
+
 
 class TestRouterRadixIntegration:
     """Ensure Router.match() goes through the radix tree."""
@@ -82,17 +163,74 @@ class TestRouterRadixIntegration:
         assert route.path == "/ping"
         assert params == {}
 
-    def test_subrouter_triggers_rebuild(self) -> None:
+    def test_method_is_normalized(self) -> None:
+        r = Router()
+        r.add_route("/ping", _handler, methods=["get"])
+        route, _ = r.match("/ping", "get")
+        assert route.methods == {"GET"}
+
+    def test_subrouter_routes_inserted_on_include(self) -> None:
         parent = Router()
         child = Router()
         child.add_route("/bar", _handler, methods=["GET"])
         parent.include_router(child, prefix="/foo")
-        # Should trigger tree rebuild
         route, params = parent.match("/foo/bar", "GET")
         assert route.path == "/foo/bar"
 
+    def test_parent_route_added_after_include(self) -> None:
+        parent = Router()
+        child = Router()
+        child.add_route("/bar", _handler)
+        parent.include_router(child, prefix="/foo")
+        parent.add_route("/own", _handler)
+        assert parent.match("/foo/bar", "GET")[0].path == "/foo/bar"
+        assert parent.match("/own", "GET")[0].path == "/own"
+
+    def test_routes_added_to_included_router_propagate(self) -> None:
+        root = Router()
+        api = Router(prefix="/api")
+        v1 = Router()
+        api.include_router(v1, prefix="/v1")
+        root.include_router(api)
+        v1.add_route("/items/{id:int}", _handler, name="item")
+        route, params = root.match("/api/v1/items/3", "GET")
+        assert (route.path, params) == ("/api/v1/items/{id:int}", {"id": 3})
+        assert root.get_route("item") is route
+        assert [r.path for r in root.routes] == ["/api/v1/items/{id:int}"]
+
     def test_websocket_route(self) -> None:
         r = Router()
         r.add_websocket_route("/ws", _handler)
         route, params = r.ws_match("/ws")
         assert route.path == "/ws"
+
+
+class TestRadixCatchAllAndFallback:
+    def test_path_param_consumes_remaining_segments(self) -> None:
+        tree = RadixTree()
+        route = Route(path="/static/{rest:path}", handler=_handler, methods={"GET"})
+        tree.insert(route)
+        found, params = tree.search("/static/css/site/main.css", "GET")
+        assert found is route
+        assert params == {"rest": "css/site/main.css"}
+
+    def test_param_preferred_over_catch_all(self) -> None:
+        tree = RadixTree()
+        single = Route(path="/files/{name}", handler=_handler, methods={"GET"})
+        rest = Route(path="/files/{rest:path}", handler=_handler, methods={"GET"})
+        tree.insert(rest)
+        tree.insert(single)
+        assert tree.search("/files/a.txt", "GET")[0] is single
+        assert tree.search("/files/a/b.txt", "GET")[0] is rest
+
+    def test_mixed_segment_uses_regex_fallback(self) -> None:
+        tree = RadixTree()
+        route = Route(path="/reports/{year:int}.csv", handler=_handler, methods={"GET"})
+        tree.insert(route)
+        found, params = tree.search("/reports/2024.csv", "GET")
+        assert found is route
+        assert params == {"year": 2024}
+        with pytest.raises(MethodNotAllowed):
+            tree.search("/reports/2024.csv", "POST")
+        with pytest.raises(NotFound):
+            tree.search("/reports/latest.csv", "GET")
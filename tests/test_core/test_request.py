@@ -1,8 +1,10 @@
 """Tests for thor.request — body parsing, size limits, properties."""
 
+from urllib.parse import parse_qs
+
 import pytest
 
-from thor.exceptions import PayloadTooLarge
+from thor.exceptions import BadRequest, PayloadTooLarge
 from thor.request import DEFAULT_MAX_BODY_SIZE, Request
 
 from tests.conftest import make_receive, make_scope
@@ -27,6 +29,37 @@ class TestRequestProperties:
         )
         assert req.headers["x-custom"] == "val"
 
+    def test_headers_shared_across_requests_on_same_scope(self) -> None:
+        scope = make_scope(headers={"X-Custom": "val"})
+        first = Request(scope, make_receive())
+        second = Request(scope, make_receive())
+        assert first.headers is second.headers
+        # Replacing the raw header list invalidates the shared dict
+        scope["headers"] = [(b"x-custom", b"other")]
+        assert Request(scope, make_receive()).headers["x-custom"] == "other"
+
+    def test_headers_appended_in_place_are_seen(self) -> None:
+        scope = make_scope(headers={"X-Custom": "val"})
+        assert Request(scope, make_receive()).get_header("x-forwarded-for") is None
+        scope["headers"].append((b"x-forwarded-for", b"10.0.0.1"))
+        assert Request(scope, make_receive()).get_header("x-forwarded-for") == "10.0.0.1"
+
+    def test_get_header_any_case(self) -> None:
+        req = Request(make_scope(headers={"X-Custom": "val"}), make_receive())
+        assert req.get_header("x-custom") == "val"
+        assert req.get_header("X-Custom") == "val"
+        assert req.get_header("x-missing", "d") == "d"
+
+    def test_header_name_cache_is_bounded(self, monkeypatch) -> None:
+        from thor import request as request_module
+
+        monkeypatch.setattr(request_module, "_HEADER_NAMES", {})
+        monkeypatch.setattr(request_module, "_HEADER_NAMES_MAX", 1)
+        scope = make_scope()
+        scope["headers"] = [(b"X-One", b"1"), (b"x-two", b"2")]
+        assert Request(scope, make_receive()).headers == {"x-one": "1", "x-two": "2"}
+        assert request_module._HEADER_NAMES == {b"X-One": "x-one"}
+
     def test_query_params(self) -> None:
         req = Request(
             make_scope(query_string="a=1&b=2"),
@@ -35,6 +68,18 @@ class TestRequestProperties:
         assert req.query_params["a"] == "1"
         assert req.query_params["b"] == "2"
 
+    @pytest.mark.parametrize(
+        "query_string",
+        ["a=1&b=2", "a=1&a=2&a=3", "flag&x=", "a=1&&b=2&", "=v", "a=b=c", "q=x%20y", "q=x+y&q=z"],
+    )
+    def test_query_params_match_parse_qs(self, query_string: str) -> None:
+        expected = {
+            key: values[0] if len(values) == 1 else values
+            for key, values in parse_qs(query_string, keep_blank_values=True).items()
+        }
+        req = Request(make_scope(query_string=query_string), make_receive())
+        assert req.query_params == expected
+
     def test_cookies(self) -> None:
         req = Request(
             make_scope(headers={"Cookie": "foo=bar; baz=qux"}),
@@ -50,6 +95,45 @@ class TestRequestProperties:
         )
         assert req.url == "http://example.com/x?q=1"
 
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("42", 42), ("0", 0), ("", None), ("abc", None), ("-5", None), ("1e3", None)],
+    )
+    def test_content_length(self, value: str, expected: int | None) -> None:
+        req = Request(make_scope(headers={"Content-Length": value}), make_receive())
+        assert req.content_length == expected
+        assert req.content_length == expected
+
+    def test_get_query_int(self) -> None:
+        req = Request(make_scope(query_string="page=3&empty=&bad=x"), make_receive())
+        assert req.get_query_int("page", 1) == 3
+        assert req.get_query_int("empty", 1) == 1
+        assert req.get_query_int("missing", 7) == 7
+        with pytest.raises(BadRequest):
+            req.get_query_int("bad")
+
+    def test_routing_fields_do_not_parse_lazy_fields(self) -> None:
+        req = Request(
+            make_scope(headers={"Cookie": "a=b"}, query_string="q=1"),
+            make_receive(),
+        )
+        assert (req.method, req.path) == ("GET", "/")
+        for lazy in ("_headers", "_cookies", "_query_string", "_query_params"):
+            assert getattr(req, lazy) is None
+
+    def test_state_created_on_first_use(self) -> None:
+        req = Request(make_scope(), make_receive())
+        assert req._state is None
+        req.state["user"] = "alice"
+        assert req.state == {"user": "alice"}
+
+    def test_lazy_fields_cached_without_instance_dict(self) -> None:
+        req = Request(make_scope(headers={"Cookie": "a=b"}, query_string="q=1"), make_receive())
+        assert not hasattr(req, "__dict__")
+        assert req.headers is req.headers
+        assert req.cookies is req.cookies
+        assert req.query_params is req.query_params
+
 
 class TestRequestBody:
     """Body reading and size enforcement."""
@@ -64,6 +148,24 @@ class TestRequestBody:
         req = Request(make_scope(), make_receive(b'{"key":"val"}'))
         assert (await req.json()) == {"key": "val"}
 
+    @pytest.mark.asyncio
+    async def test_read_json_empty_and_stdlib_only_values(self) -> None:
+        assert await Request(make_scope(), make_receive(b"")).json() is None
+        big = await Request(make_scope(), make_receive(b'[NaN, 123456789012345678901234567890]')).json()
+        assert big[1] == 123456789012345678901234567890
+        assert big[0] != big[0]
+
+    @pytest.mark.asyncio
+    async def test_read_json_invalid(self) -> None:
+        with pytest.raises(ValueError):
+            await Request(make_scope(), make_receive(b"{nope")).json()
+
+    @pytest.mark.asyncio
+    async def test_read_urlencoded_form(self) -> None:
+        body = "name=J%C3%B6rg+S&tag=a&tag=b&empty=&flag".encode()
+        form = await Request(make_scope(), make_receive(body)).form()
+        assert form == {"name": "Jörg S", "tag": ["a", "b"], "empty": "", "flag": ""}
+
     @pytest.mark.asyncio
     async def test_body_cached(self) -> None:
         req = Request(make_scope(), make_receive(b"data"))
@@ -71,6 +173,54 @@ class TestRequestBody:
         b2 = await req.body()
         assert b1 is b2
 
+    @pytest.mark.asyncio
+    async def test_single_message_body_not_copied(self) -> None:
+        payload = b"x" * 100
+        req = Request(make_scope(), make_receive(payload))
+        assert await req.body() is payload
+
+    @pytest.mark.asyncio
+    async def test_multi_message_body(self) -> None:
+        messages = [
+            {"type": "http.request", "body": b"ab", "more_body": True},
+            {"type": "http.request", "body": b"", "more_body": True},
+            {"type": "http.request", "body": b"cd", "more_body": False},
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        req = Request(make_scope(), receive)
+        assert await req.body() == b"abcd"
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_unjoined(self) -> None:
+        messages = [
+            {"type": "http.request", "body": b"ab", "more_body": True},
+            {"type": "http.request", "body": b"", "more_body": True},
+            {"type": "http.request", "body": b"cd", "more_body": False},
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        req = Request(make_scope(), receive)
+        assert [chunk async for chunk in req.stream()] == [b"ab", b"cd"]
+        assert await req.body() == b""
+
+    @pytest.mark.asyncio
+    async def test_stream_after_body_read(self) -> None:
+        req = Request(make_scope(), make_receive(b"data"))
+        await req.body()
+        assert [chunk async for chunk in req.stream()] == [b"data"]
+
+    @pytest.mark.asyncio
+    async def test_stream_enforces_size_limit(self) -> None:
+        req = Request(make_scope(), make_receive(b"x" * 2048), max_body_size=1024)
+        with pytest.raises(PayloadTooLarge):
+            async for _chunk in req.stream():
+                pass
+
     @pytest.mark.asyncio
     async def test_payload_too_large_via_content_length(self) -> None:
         scope = make_scope(headers={"Content-Length": "999999999"})
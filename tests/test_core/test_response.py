@@ -11,6 +11,7 @@ from thor.response import (
     HTMLResponse,
     JSONResponse,
     RedirectResponse,
+    StaticResponse,
     TextResponse,
 )
 
@@ -42,15 +43,161 @@ class TestJSONResponse:
         r = JSONResponse({"a": 1})
         assert json.loads(r.render()) == {"a": 1}
 
+    def test_body_rendered_once(self) -> None:
+        r = JSONResponse({"a": 1})
+        assert r.body is r.body
+
     def test_null(self) -> None:
         assert JSONResponse(None).render() == b"null"
 
+    def test_compact_unicode_output(self) -> None:
+        assert JSONResponse({"a": [1, "é"]}).render() == '{"a":[1,"é"]}'.encode()
+
+    def test_non_str_keys_and_big_ints(self) -> None:
+        r = JSONResponse({1: 2**70})
+        assert json.loads(r.render()) == {"1": 2**70}
+
+    def test_mapping_view(self) -> None:
+        from types import MappingProxyType
+
+        r = JSONResponse({"session": MappingProxyType({"a": 1})})
+        assert json.loads(r.render()) == {"session": {"a": 1}}
+
+    def test_indent(self) -> None:
+        assert JSONResponse({"a": 1}, indent=2).render() == b'{\n  "a": 1\n}'
+
     @pytest.mark.asyncio
     async def test_send(self) -> None:
         cap = ResponseCapture()
         await JSONResponse({"ok": True}, status_code=201)(cap)
         assert cap.status == 201
         assert json.loads(cap.body) == {"ok": True}
+        assert cap.headers["content-length"] == str(len(cap.body))
+        body_messages = [m for m in cap.messages if m["type"] == "http.response.body"]
+        assert len(body_messages) == 1
+        assert body_messages[0]["more_body"] is False
+
+    @pytest.mark.asyncio
+    async def test_no_content_length_on_204(self) -> None:
+        cap = ResponseCapture()
+        await TextResponse("", status_code=204)(cap)
+        assert "content-length" not in cap.headers
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_encoder(request, monkeypatch) -> str:
+    """Run a test once through orjson (when installed) and once through stdlib json."""
+    from thor import response as response_module
+
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(response_module, "orjson", None)
+    return request.param
+
+
+class TestJSONEncoderParity:
+    def test_extended_types(self, json_encoder: str) -> None:
+        import dataclasses
+        import enum
+        from datetime import UTC, date, datetime
+        from uuid import UUID
+
+        class Color(enum.Enum):
+            RED = "red"
+
+        @dataclasses.dataclass
+        class Point:
+            x: int
+            _tag: str = "p"
+
+        content = {
+            "t": datetime(2024, 5, 1, 12, 30, 0, 5, tzinfo=UTC),
+            "d": date(2024, 5, 1),
+            "u": UUID(int=1),
+            "c": Color.RED,
+            "p": Point(1),
+        }
+        expected = {
+            "t": "2024-05-01T12:30:00.000005+00:00",
+            "d": "2024-05-01",
+            "u": "00000000-0000-0000-0000-000000000001",
+            "c": "red",
+            "p": {"x": 1, "_tag": "p"},
+        }
+        assert json.loads(JSONResponse(content).render()) == expected
+        assert json.loads(JSONResponse(content, indent=2).render()) == expected
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+    def test_non_finite_floats_rejected(self, json_encoder: str, value: float) -> None:
+        with pytest.raises(ValueError):
+            JSONResponse({"a": [1, {"b": value}], "c": None}).render()
+
+    def test_null_without_non_finite_floats(self, json_encoder: str) -> None:
+        assert JSONResponse({"a": None, "b": 1.5}).render() == b'{"a":null,"b":1.5}'
+
+    def test_unsupported_type(self, json_encoder: str) -> None:
+        with pytest.raises(TypeError):
+            JSONResponse({"a": object()}).render()
+
+
+class TestRawHeaders:
+    @pytest.mark.asyncio
+    async def test_extend_raw_headers(self) -> None:
+        r = TextResponse("hi").extend_raw_headers([(b"x-a", b"1")]).extend_raw_headers([(b"x-b", b"2")])
+        cap = ResponseCapture()
+        await r(cap)
+        names = [name for name, _ in cap.messages[0]["headers"]]
+        assert names.index(b"x-a") < names.index(b"x-b")
+        assert cap.headers["content-length"] == "2"
+
+    def test_custom_header_names_lower_cased_and_shared(self) -> None:
+        first = TextResponse("a", headers={"X-Trace": "1"})._build_headers()[1]
+        second = TextResponse("b", headers={"X-Trace": "2"})._build_headers()[1]
+        assert first == (b"x-trace", b"1")
+        assert first[0] is second[0]
+
+
+class TestContentType:
+    def test_header_pair_shared_across_responses(self) -> None:
+        first = JSONResponse({"a": 1})._build_headers()[0]
+        second = JSONResponse([1])._build_headers()[0]
+        assert first == (b"content-type", b"application/json; charset=utf-8")
+        assert first is second
+
+    def test_binary_media_type_has_no_charset(self) -> None:
+        r = StaticResponse(b"x", media_type="image/png")
+        assert r._build_headers()[0] == (b"content-type", b"image/png")
+
+    def test_overridden_content_type_property(self) -> None:
+        class Custom(TextResponse):
+            @property
+            def content_type(self) -> str:
+                return "text/x-custom"
+
+        assert Custom("x")._build_headers()[0] == (b"content-type", b"text/x-custom")
+
+    def test_class_pair_precomputed(self) -> None:
+        assert JSONResponse._content_type_pair == (b"content-type", b"application/json; charset=utf-8")
+        assert JSONResponse({})._build_headers()[0] is JSONResponse._content_type_pair
+
+    def test_instance_media_type_overrides_class_pair(self) -> None:
+        r = TextResponse("x")
+        r.media_type = "text/csv"
+        assert r._build_headers()[0] == (b"content-type", b"text/csv; charset=utf-8")
+
+
+class TestSetCookie:
+    def test_cookies_sent_after_custom_headers(self) -> None:
+        r = TextResponse("x", headers={"X-A": "1"}).set_cookie("a", "1").delete_cookie("b")
+        headers = r._build_headers()
+        assert headers[1] == (b"x-a", b"1")
+        assert headers[2] == (b"set-cookie", b"a=1; Path=/; Secure; HttpOnly; SameSite=Lax")
+        assert headers[3][1].startswith(b"b=; Max-Age=0")
+
+    def test_unencodable_value_fails_at_call_site(self) -> None:
+        with pytest.raises(UnicodeEncodeError):
+            TextResponse("x").set_cookie("a", "\u2603")
 
 
 class TestRedirectResponse:
@@ -95,3 +242,63 @@ class TestFileResponse:
             assert len(cap.body) == 200
         finally:
             os.unlink(path)
+
+    @pytest.mark.asyncio
+    async def test_chunks_without_pathsend_extension(self) -> None:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as f:
+            f.write(b"A" * 200)
+            path = f.name
+        try:
+            cap = ResponseCapture()
+            resp = FileResponse(path, chunk_size=64)
+            await resp(cap, {"type": "http", "extensions": {}})
+            assert [m["type"] for m in cap.messages].count("http.response.body") == 5
+            assert cap.body == b"A" * 200
+        finally:
+            os.unlink(path)
+
+    @pytest.mark.asyncio
+    async def test_pathsend_extension(self) -> None:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".bin") as f:
+            f.write(b"A" * 200)
+            path = f.name
+        try:
+            cap = ResponseCapture()
+            resp = FileResponse(path)
+            await resp(cap, {"type": "http", "extensions": {"http.response.pathsend": {}}})
+            assert cap.headers["content-length"] == "200"
+            assert cap.messages[-1] == {"type": "http.response.pathsend", "path": resp._path}
+            assert cap.body == b""
+        finally:
+            os.unlink(path)
+
+
+class TestStaticResponse:
+    @pytest.mark.asyncio
+    async def test_reused_across_sends(self) -> None:
+        r = StaticResponse(b'{"ok":true}')
+        for _ in range(2):
+            cap = ResponseCapture()
+            await r(cap)
+            assert cap.body == b'{"ok":true}'
+            assert cap.headers["content-length"] == "11"
+            assert cap.headers["content-type"] == "application/json; charset=utf-8"
+
+    @pytest.mark.asyncio
+    async def test_header_list_is_copied_per_send(self) -> None:
+        r = StaticResponse(b"x", media_type="text/plain")
+        cap = ResponseCapture()
+        await r(cap)
+        cap.messages[0]["headers"].append((b"x-extra", b"1"))
+        cap2 = ResponseCapture()
+        await r(cap2)
+        assert "x-extra" not in cap2.headers
+
+    @pytest.mark.asyncio
+    async def test_extend_raw_headers_invalidates_cache(self) -> None:
+        r = StaticResponse(b"x", media_type="text/plain")
+        await r(ResponseCapture())
+        r.extend_raw_headers([(b"x-raw", b"1")])
+        cap = ResponseCapture()
+        await r(cap)
+        assert cap.headers["x-raw"] == "1"
@@ -1,8 +1,10 @@
 """Tests for thor.routing — pattern matching, type conversion, subrouters."""
 
+import sys
+
 import pytest
 
-from thor.exceptions import MethodNotAllowed, NotFound
+from thor.exceptions import MethodNotAllowed, NotFound, RoutingError
 from thor.routing import Route, Router
 
 
@@ -36,6 +38,31 @@ class TestRoute:
         assert route.match("/posts/my-first-post") is not None
         assert route.match("/posts/CAPS") is None  # slugs are lowercase
 
+    def test_methods_normalised_to_interned_frozenset(self) -> None:
+        async def handler() -> None: ...
+        route = Route("/x", handler, methods={"get", "Post"})
+        assert route.methods == frozenset({"GET", "POST"})
+        assert isinstance(route.methods, frozenset)
+        assert all(m is sys.intern(m) for m in route.methods)
+        assert Route("/x", handler).methods == frozenset({"GET"})
+
+    def test_same_template_compiled_once(self) -> None:
+        async def handler() -> None: ...
+        first = Route("/users/{user_id:int}", handler)
+        second = Route("/users/{user_id:int}", handler, methods={"POST"})
+        assert first._pattern is second._pattern
+        assert second.match("/users/5") == {"user_id": 5}
+
+    def test_build_path_inserts_backslashes_literally(self) -> None:
+        async def handler() -> None: ...
+        route = Route("/files/{name}", handler)
+        assert route.build_path(name=r"a\1\g<0>") == r"/files/a\1\g<0>"
+
+    def test_unknown_param_type(self) -> None:
+        async def handler() -> None: ...
+        with pytest.raises(RoutingError, match="Unknown parameter type"):
+            Route("/users/{user_id:float}", handler)
+
 
 class TestRouter:
     def test_add_route_and_match(self) -> None:
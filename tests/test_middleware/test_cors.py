@@ -41,6 +41,35 @@ class TestCORSOriginValidation:
         await mw(scope, make_receive(b""), cap)
         assert "access-control-allow-origin" not in cap.headers
 
+    def test_origin_matching_combinations(self) -> None:
+        mw = CORSMiddleware(
+            _ok_app,
+            allow_origins=["https://a.com", "*.b.com", "*.c.org"],
+            allow_origin_regex=r"https://d\d+\.net",
+        )
+        assert mw._is_origin_allowed("https://a.com")
+        assert mw._is_origin_allowed("https://x.b.com")
+        assert mw._is_origin_allowed("http://y.z.c.org")
+        assert mw._is_origin_allowed("https://d42.net")
+        assert not mw._is_origin_allowed("https://a.com.evil")
+        assert not mw._is_origin_allowed("https://b.com")
+        assert not mw._is_origin_allowed("https://dx.net")
+
+    async def test_headers_cached_per_origin(self) -> None:
+        mw = CORSMiddleware(_ok_app, allow_origins=["https://a.com"], expose_headers=["X-Id"])
+        for _ in range(3):
+            cap = ResponseCapture()
+            await mw(make_scope(headers={"origin": "https://a.com"}), make_receive(b""), cap)
+            assert cap.headers["access-control-expose-headers"] == "X-Id"
+        info = mw._cors_headers.cache_info()
+        assert (info.hits, info.misses) == (2, 1)
+
+    def test_regex_with_backreference_still_compiles(self) -> None:
+        # RE2 rejects backreferences; such patterns fall back to ``re``
+        mw = CORSMiddleware(_ok_app, allow_origins=[], allow_origin_regex=r"https://(\w+)\.\1\.io")
+        assert mw._is_origin_allowed("https://ab.ab.io")
+        assert not mw._is_origin_allowed("https://ab.cd.io")
+
     async def test_regex_origin(self) -> None:
         mw = CORSMiddleware(
             _ok_app,
@@ -100,3 +129,37 @@ class TestCORSOriginValidation:
         await mw(scope, make_receive(b""), cap)
         assert cap.status == 204
         assert cap.headers["access-control-allow-origin"] == "https://app.mysite.io"
+
+    async def test_preflight_headers_cached_but_not_shared(self) -> None:
+        mw = CORSMiddleware(_ok_app, allow_origins=["https://a.com"], max_age=60)
+        caps = []
+        for _ in range(2):
+            cap = ResponseCapture()
+            await mw(make_scope(method="OPTIONS", headers={"origin": "https://a.com"}), make_receive(b""), cap)
+            caps.append(cap)
+        assert caps[1].status == 204
+        assert caps[1].headers["access-control-max-age"] == "60"
+        assert caps[1].headers["access-control-allow-origin"] == "https://a.com"
+        assert mw._preflight_headers.cache_info().hits == 1
+        # Each preflight gets its own header list
+        assert caps[0].messages[0]["headers"] is not caps[1].messages[0]["headers"]
+
+    async def test_any_origin_specialised_process(self) -> None:
+        mw = CORSMiddleware(_ok_app, allow_origins=["*"], expose_headers=["X-Total"])
+        assert mw.process == mw._process_any_origin
+        cap = ResponseCapture()
+        await mw.process(make_scope(headers={"origin": "https://x.com"}), make_receive(b""), cap)
+        assert cap.headers["access-control-allow-origin"] == "*"
+        assert cap.headers["access-control-expose-headers"] == "X-Total"
+        assert "vary" not in cap.headers
+
+        cap = ResponseCapture()
+        await mw(make_scope(method="OPTIONS"), make_receive(b""), cap)
+        assert cap.status == 204
+        assert cap.headers["access-control-allow-origin"] == "*"
+        assert "access-control-max-age" in cap.headers
+
+    def test_origin_dependent_configs_keep_generic_process(self) -> None:
+        for options in ({"allow_origins": ["https://a.com"]}, {"allow_origins": ["*.a.com"]}):
+            mw = CORSMiddleware(_ok_app, **options)
+            assert "process" not in vars(mw)
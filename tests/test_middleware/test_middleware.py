@@ -2,16 +2,20 @@
 
 import asyncio
 import json
+import logging
 
 import pytest
 
-from thor.exceptions import BadRequest, RequestTimeout
+from thor.exceptions import BadRequest, RequestTimeout, TooManyRequests, Unauthorized
 from thor.middleware import (
     CORSMiddleware,
     ErrorHandlerMiddleware,
+    Middleware,
+    MiddlewareStack,
     TimeoutMiddleware,
     RequestLoggingMiddleware,
 )
+from thor.middleware.base import SendWithHeaders
 
 from tests.conftest import ResponseCapture, make_receive, make_scope
 
@@ -35,6 +39,23 @@ class TestErrorHandlerMiddleware:
         assert body["error"] == "oops"
         assert "request_id" in body
 
+    @pytest.mark.asyncio
+    async def test_exception_headers_are_sent(self) -> None:
+        async def app(scope, receive, send):
+            raise Unauthorized(headers={"X-Reason": "expired"})
+
+        cap = ResponseCapture()
+        await ErrorHandlerMiddleware(app)(make_scope(), make_receive(), cap)
+        assert cap.status == 401
+        assert cap.headers["www-authenticate"] == "Bearer"
+        assert cap.headers["x-reason"] == "expired"
+
+    def test_raw_headers_encode_current_headers(self) -> None:
+        exc = TooManyRequests(retry_after=30)
+        exc.headers["X-Extra"] = "1"
+        assert exc.raw_headers == ((b"retry-after", b"30"), (b"x-extra", b"1"))
+        assert Unauthorized().raw_headers == ((b"www-authenticate", b"Bearer"),)
+
     @pytest.mark.asyncio
     async def test_never_leaks_internal_details(self) -> None:
         async def app(scope, receive, send):
@@ -57,10 +78,13 @@ class TestErrorHandlerMiddleware:
 
         mw = ErrorHandlerMiddleware(app)
         cap = ResponseCapture()
-        await mw(make_scope(), make_receive(), cap)
+        scope = make_scope()
+        await mw(scope, make_receive(), cap)
 
         assert "x-request-id" in cap.headers
-        assert len(cap.headers["x-request-id"]) > 0
+        assert cap.headers["x-request-id"] == scope["request_id"]
+        assert len(scope["request_id"]) == 32
+        int(scope["request_id"], 16)
 
 
 # ---------------------------------------------------------------------------
@@ -137,3 +161,98 @@ class TestRequestLoggingMiddleware:
         # Should not raise
         await mw(make_scope(), make_receive(), cap)
         assert cap.status == 200
+
+    @pytest.mark.asyncio
+    async def test_log_record(self, caplog) -> None:
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        mw = RequestLoggingMiddleware(app)
+        with caplog.at_level(logging.INFO, logger="thor.access"):
+            await mw(make_scope(method="POST", path="/items"), make_receive(), ResponseCapture())
+        assert "POST /items 201" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_disabled_level_skips_wrapper(self, caplog) -> None:
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append(send)
+
+        mw = RequestLoggingMiddleware(app, log_level=logging.DEBUG)
+        cap = ResponseCapture()
+        with caplog.at_level(logging.INFO, logger="thor.access"):
+            await mw(make_scope(), make_receive(), cap)
+        assert seen == [cap]
+        assert caplog.records == []
+
+
+# ---------------------------------------------------------------------------
+# MiddlewareStack
+# ---------------------------------------------------------------------------
+
+class _Tag(Middleware):
+    def __init__(self, app, name: str) -> None:
+        super().__init__(app)
+        self.name = name
+
+    async def process(self, scope, receive, send) -> None:
+        scope.setdefault("trail", []).append(self.name)
+        await self.app(scope, receive, send)
+
+
+class TestMiddlewareStack:
+    async def _endpoint(self, scope, receive, send) -> None:
+        scope.setdefault("trail", []).append("endpoint")
+
+    def _stack(self) -> MiddlewareStack:
+        stack = MiddlewareStack(self._endpoint)
+        stack.add(_Tag, name="outer")
+        stack.add(_Tag, name="inner")
+        return stack
+
+    async def test_build_preserves_order(self) -> None:
+        scope = make_scope()
+        await self._stack().build()(scope, make_receive(), ResponseCapture())
+        assert scope["trail"] == ["outer", "inner", "endpoint"]
+
+    async def test_http_only_build_links_process_methods(self) -> None:
+        chain = self._stack().build(http_only=True)
+        outer = chain.__self__
+        assert outer.name == "outer"
+        assert outer.app == outer.app.__self__.process  # inner layer's process()
+        scope = make_scope()
+        await chain(scope, make_receive(), ResponseCapture())
+        assert scope["trail"] == ["outer", "inner", "endpoint"]
+
+    async def test_default_build_passes_other_scopes_through(self) -> None:
+        scope = {"type": "websocket"}
+        await self._stack().build()(scope, make_receive(), ResponseCapture())
+        assert scope["trail"] == ["endpoint"]
+
+
+# ---------------------------------------------------------------------------
+# SendWithHeaders
+# ---------------------------------------------------------------------------
+
+class TestSendWithHeaders:
+    @pytest.mark.asyncio
+    async def test_extends_header_list_in_place(self) -> None:
+        cap = ResponseCapture()
+        headers = [(b"content-type", b"text/plain")]
+        await SendWithHeaders(cap, ((b"x-a", b"1"),))(
+            {"type": "http.response.start", "status": 200, "headers": headers}
+        )
+        assert cap.messages[0]["headers"] is headers
+        assert headers == [(b"content-type", b"text/plain"), (b"x-a", b"1")]
+
+    @pytest.mark.asyncio
+    async def test_non_list_headers_are_copied(self) -> None:
+        cap = ResponseCapture()
+        await SendWithHeaders(cap, ((b"x-a", b"1"),))({"type": "http.response.start", "status": 200})
+        await SendWithHeaders(cap, ((b"x-b", b"2"),))(
+            {"type": "http.response.start", "status": 200, "headers": ((b"x-c", b"3"),)}
+        )
+        assert cap.messages[0]["headers"] == [(b"x-a", b"1")]
+        assert cap.messages[1]["headers"] == [(b"x-c", b"3"), (b"x-b", b"2")]
@@ -1,5 +1,7 @@
 """Tests for RateLimitMiddleware."""
 
+import asyncio
+
 import pytest
 
 from thor.middleware import RateLimitMiddleware
@@ -29,6 +31,14 @@ class TestRateLimitMiddleware:
         assert cap.headers["x-ratelimit-limit"] == "10"
         assert "x-ratelimit-remaining" in cap.headers
 
+    async def test_header_values_beyond_precomputed_range(self) -> None:
+        mw = RateLimitMiddleware(_ok_app, max_requests=10_000, window_seconds=1)
+        cap = ResponseCapture()
+        await mw(make_scope(), make_receive(b""), cap)
+        assert cap.headers["x-ratelimit-limit"] == "10000"
+        assert cap.headers["x-ratelimit-remaining"] == "9999"
+        assert cap.headers["x-ratelimit-reset"] == "1"
+
     async def test_blocks_over_limit(self) -> None:
         mw = RateLimitMiddleware(_ok_app, max_requests=3, window_seconds=60)
         for _ in range(3):
@@ -60,3 +70,46 @@ class TestRateLimitMiddleware:
         cap_a2 = ResponseCapture()
         await mw(scope_a, make_receive(b""), cap_a2)
         assert cap_a2.status == 429
+
+    async def test_bucket_refills_over_time(self, monkeypatch) -> None:
+        clock = [1000.0]
+        monkeypatch.setattr(asyncio.get_running_loop(), "time", lambda: clock[0])
+        mw = RateLimitMiddleware(_ok_app, max_requests=2, window_seconds=10)
+        for _ in range(2):
+            cap = ResponseCapture()
+            await mw(make_scope(), make_receive(b""), cap)
+        cap = ResponseCapture()
+        await mw(make_scope(), make_receive(b""), cap)
+        assert cap.status == 429
+        assert cap.headers["retry-after"] == "5"
+        clock[0] += 5  # one token at 0.2 tokens/s
+        cap = ResponseCapture()
+        await mw(make_scope(), make_receive(b""), cap)
+        assert cap.status == 200
+        assert cap.headers["x-ratelimit-remaining"] == "0"
+
+    @pytest.mark.parametrize("max_clients", [1, 2, 16])
+    async def test_tracked_clients_are_bounded(self, max_clients: int) -> None:
+        mw = RateLimitMiddleware(
+            _ok_app, max_requests=5, window_seconds=60, max_clients=max_clients
+        )
+        ips = [f"10.0.0.{i}" for i in range(200)]
+        for ip in ips:
+            await mw(make_scope(extras={"client": (ip, 1)}), make_receive(b""), ResponseCapture())
+        tracked = [ip for shard in mw._shards for ip in shard]
+        assert len(tracked) == max_clients
+        assert ips[-1] in tracked
+
+    async def test_shard_does_not_evict_under_cap(self) -> None:
+        mw = RateLimitMiddleware(_ok_app, max_requests=5, window_seconds=60, max_clients=16)
+
+        # Three IPs that land in the same shard
+        def shard(ip: str) -> int:
+            return hash(ip) & 15
+
+        candidates = (f"10.0.{i // 256}.{i % 256}" for i in range(10_000))
+        first = next(candidates)
+        same_shard = [first, *[ip for ip in candidates if shard(ip) == shard(first)][:2]]
+        for ip in same_shard:
+            await mw(make_scope(extras={"client": (ip, 1)}), make_receive(b""), ResponseCapture())
+        assert list(mw._shards[shard(first)]) == same_shard
@@ -24,6 +24,11 @@ class TestLifespanState:
         s = LifespanState()
         assert s.get("missing", 42) == 42
 
+    def test_state_is_plain_dict(self) -> None:
+        lifespan = Lifespan()
+        assert type(lifespan.state) is dict
+        assert LifespanProtocolHandler(lambda *a: None, lifespan).state is lifespan.state
+
 
 class TestLifespan:
     async def test_startup_shutdown_handlers(self) -> None:
@@ -115,3 +120,37 @@ class TestLifespanProtocolHandler:
         h = self._make_handler(shutdown_timeout=0.5)
         # Should complete quickly
         await asyncio.wait_for(h._drain_requests(), timeout=1.0)
+
+    async def test_drain_waits_for_inflight(self) -> None:
+        release = asyncio.Event()
+
+        async def blocking_app(scope, receive, send):
+            await release.wait()
+
+        h = LifespanProtocolHandler(blocking_app, shutdown_timeout=1.0)
+        task = asyncio.create_task(h({"type": "http"}, lambda: asyncio.sleep(0), lambda m: asyncio.sleep(0)))
+        await asyncio.sleep(0)
+        assert h._inflight_zero is None  # no Event on the request path
+        drain = asyncio.create_task(h._drain_requests())
+        await asyncio.sleep(0.01)
+        assert not drain.done()
+        release.set()
+        await asyncio.wait_for(drain, timeout=1.0)
+        await task
+        assert h.inflight_requests == 0
+
+    async def test_websocket_not_counted_as_inflight(self) -> None:
+        counts: list[int] = []
+        h: LifespanProtocolHandler
+
+        async def app(scope, receive, send):
+            counts.append(h.inflight_requests)
+            assert scope["state"] is h.state
+
+        h = LifespanProtocolHandler(app)
+        async def noop(*args) -> None:
+            pass
+
+        await h({"type": "websocket"}, noop, noop)
+        await h({"type": "http"}, noop, noop)
+        assert counts == [0, 1]
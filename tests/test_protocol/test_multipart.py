@@ -2,7 +2,9 @@
 
 import pytest
 
-from thor.multipart import UploadFile, parse_multipart
+from thor import multipart
+from thor.exceptions import PayloadTooLarge
+from thor.multipart import UploadFile, parse_multipart, parse_multipart_stream
 from thor.request import Request
 
 from tests.conftest import make_receive, make_scope
@@ -32,6 +34,17 @@ def _build_multipart(boundary: str, parts: list[dict]) -> bytes:
     return b"".join(lines)
 
 
+def _chunked_receive(body: bytes, size: int):
+    """ASGI receive callable delivering *body* in *size*-byte chunks."""
+    chunks = [body[i : i + size] for i in range(0, len(body), size)] or [b""]
+
+    async def receive() -> dict:
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    return receive
+
+
 class TestUploadFile:
     async def test_read_and_size(self) -> None:
         uf = UploadFile(filename="test.txt")
@@ -47,6 +60,51 @@ class TestUploadFile:
         uf.close()
         assert uf.file.closed
 
+    async def test_large_upload_spills_to_disk(self, monkeypatch) -> None:
+        monkeypatch.setattr(multipart, "SPOOL_MAX_SIZE", 8)
+        body = _build_multipart("B", [
+            {"name": "f", "filename": "big.bin", "data": b"x" * 64},
+        ])
+        _fields, files = parse_multipart(body, "B")
+        assert files[0].file._rolled
+        assert files[0].size == 64
+        assert await files[0].read() == b"x" * 64
+
+    def test_size_tracked_by_parser(self) -> None:
+        body = _build_multipart("B", [
+            {"name": "f", "filename": "a.bin", "data": b"abcdef"},
+        ])
+        _fields, files = parse_multipart(body, "B")
+        files[0].file.seek(3)
+        assert files[0].size == 6
+        assert files[0].file.tell() == 3
+
+
+class TestParseMultipartStream:
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+    async def test_matches_buffered_parser(self, chunk_size: int) -> None:
+        body = b"preamble\r\n" + _build_multipart("XyZ", [
+            {"name": "tag", "data": "python"},
+            {"name": "tag", "data": "web"},
+            {"name": "blob", "filename": "b.bin", "data": b"\r\n--Xy-\r\n" * 5},
+            {"name": "empty", "data": ""},
+        ]) + b"epilogue"
+        fields, files = await parse_multipart_stream(_chunked_receive(body, chunk_size), "XyZ")
+        expected_fields, expected_files = parse_multipart(body, "XyZ")
+        assert fields == expected_fields
+        assert [f.filename for f in files] == [f.filename for f in expected_files]
+        assert files[0].file.read() == expected_files[0].file.read()
+        assert files[0].size == expected_files[0].size == 45
+
+    async def test_truncated_body_drops_unfinished_upload(self) -> None:
+        body = _build_multipart("B", [
+            {"name": "a", "data": "1"},
+            {"name": "f", "filename": "cut.bin", "data": b"partial"},
+        ])
+        fields, files = await parse_multipart_stream(_chunked_receive(body[:-20], 16), "B")
+        assert fields == {"a": "1"}
+        assert files == []
+
 
 class TestParseMultipart:
     def test_single_field(self) -> None:
@@ -85,8 +143,52 @@ class TestParseMultipart:
         fields, _files = parse_multipart(body, "Z")
         assert fields["tag"] == ["python", "web"]
 
+    def test_delimiter_only_matches_at_line_start(self) -> None:
+        body = _build_multipart("B", [
+            {"name": "note", "data": "a--Bb--B"},
+        ])
+        fields, _files = parse_multipart(body, "B")
+        assert fields["note"] == "a--Bb--B"
+
+    def test_repeated_header_blocks_give_independent_uploads(self) -> None:
+        body = _build_multipart("B", [
+            {"name": "f", "filename": "a.txt", "data": b"1"},
+        ])
+        _f, first = parse_multipart(body, "B")
+        first[0].headers["x-added"] = "1"
+        _f, second = parse_multipart(body, "B")
+        assert "x-added" not in second[0].headers
+        assert second[0].headers["content-type"] == "application/octet-stream"
+
+    def test_preamble_and_boundary_like_content(self) -> None:
+        body = b"ignored preamble\r\n" + _build_multipart("XyZ", [
+            {"name": "note", "data": "--Xy is not the boundary\r\n--"},
+            {"name": "blob", "filename": "b.bin", "data": b"\r\n--Xy-\r\n"},
+            {"name": "empty", "data": ""},
+        ])
+        fields, files = parse_multipart(body, "XyZ")
+        assert fields["note"] == "--Xy is not the boundary\r\n--"
+        assert fields["empty"] == ""
+        assert files[0].file.read() == b"\r\n--Xy-\r\n"
+
 
 class TestRequestMultipart:
+    @pytest.mark.parametrize(
+        "content_type",
+        [
+            "multipart/form-data; boundary=abc",
+            'multipart/form-data; BOUNDARY="abc"',
+            "multipart/form-data;boundary=abc; charset=utf-8",
+        ],
+    )
+    def test_boundary_extraction(self, content_type: str) -> None:
+        req = Request(make_scope(headers={"content-type": content_type}), make_receive())
+        assert req._extract_boundary() == "abc"
+
+    def test_missing_boundary(self) -> None:
+        req = Request(make_scope(headers={"content-type": "multipart/form-data"}), make_receive())
+        assert req._extract_boundary() is None
+
     async def test_request_files(self) -> None:
         boundary = "testboundary"
         body = _build_multipart(boundary, [
@@ -114,3 +216,32 @@ class TestRequestMultipart:
         req = Request(scope, make_receive(body), max_body_size=0)
         form = await req.form()
         assert form["name"] == "Thor"
+
+    async def test_streamed_once_and_cached(self) -> None:
+        boundary = "sb"
+        body = _build_multipart(boundary, [
+            {"name": "name", "data": "Thor"},
+            {"name": "file", "filename": "a.txt", "data": b"abc"},
+        ])
+        scope = make_scope(
+            method="POST",
+            headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+        )
+        req = Request(scope, _chunked_receive(body, 10), max_body_size=0)
+        form = await req.form()
+        files = await req.files()
+        assert form["name"] == "Thor"
+        assert await files[0].read() == b"abc"
+
+    async def test_streamed_body_size_limit(self) -> None:
+        boundary = "sb"
+        body = _build_multipart(boundary, [
+            {"name": "file", "filename": "a.bin", "data": b"x" * 100},
+        ])
+        scope = make_scope(
+            method="POST",
+            headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+        )
+        req = Request(scope, _chunked_receive(body, 10), max_body_size=50)
+        with pytest.raises(PayloadTooLarge):
+            await req.files()
@@ -0,0 +1,264 @@
+"""Tests for thor.auth — JWT backend and payload caching."""
+
+import base64
+import dataclasses
+import time
+
+import jwt
+import pytest
+
+from tests.conftest import ResponseCapture, make_receive, make_scope
+from thor.auth import (
+    AnonymousUser,
+    AuthMiddleware,
+    BasicAuthBackend,
+    JWTAuthBackend,
+    TokenAuthBackend,
+    User,
+    login_required,
+    require_scopes,
+)
+from thor.exceptions import Forbidden, Unauthorized
+from thor.request import Request
+
+SECRET = "jwt-secret-for-tests-0123456789abcdef"
+
+
+def _request(token: str, scheme: str = "Bearer") -> Request:
+    scope = make_scope(headers={"Authorization": f"{scheme} {token}"})
+    return Request(scope, make_receive())
+
+
+def _raw_request(header: str) -> Request:
+    return Request(make_scope(headers={"Authorization": header}), make_receive())
+
+
+def _token(**claims) -> str:
+    payload = {"sub": "1", "username": "thor", "exp": int(time.time()) + 60}
+    payload.update(claims)
+    return jwt.encode(payload, SECRET, algorithm="HS256")
+
+
+class TestJWTAuthBackend:
+    async def test_valid_token(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        user = await backend.authenticate(_request(_token(scopes=["read"])))
+        assert user.is_authenticated
+        assert user.username == "thor"
+        assert user.scopes == ["read"]
+
+    async def test_repeat_token_skips_decode(self, monkeypatch) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        token = _token()
+        calls = 0
+        real_decode = jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return real_decode(*args, **kwargs)
+
+        monkeypatch.setattr(jwt, "decode", counting_decode)
+        for _ in range(3):
+            user = await backend.authenticate(_request(token))
+            assert user.is_authenticated
+        assert calls == 1
+
+    async def test_invalid_token_not_cached(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        bad = jwt.encode({"sub": "1"}, "another-secret-entirely-xxxxxxxx", algorithm="HS256")
+        assert not (await backend.authenticate(_request(bad))).is_authenticated
+        assert bad not in backend._cache
+
+    async def test_expired_cache_entry_is_rechecked(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        token = _token()
+        backend._cache[token] = ({"sub": "1"}, time.time() - 1)
+        user = await backend.authenticate(_request(token))
+        assert user.is_authenticated
+        assert backend._cache[token][1] > time.time()
+
+    async def test_cache_is_bounded(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET, cache_size=2)
+        tokens = [_token(sub=str(i)) for i in range(3)]
+        for token in tokens:
+            await backend.authenticate(_request(token))
+        assert list(backend._cache) == tokens[1:]
+
+    async def test_cache_evicts_least_recently_used(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET, cache_size=2)
+        first, second, third = (_token(sub=str(i)) for i in range(3))
+        await backend.authenticate(_request(first))
+        await backend.authenticate(_request(second))
+        await backend.authenticate(_request(first))  # refresh
+        await backend.authenticate(_request(third))
+        assert list(backend._cache) == [first, third]
+
+    async def test_hot_tokens_survive_invalid_burst(self, monkeypatch) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET, cache_size=2)
+        hot = [_token(sub=str(i)) for i in range(2)]
+        for token in hot:
+            await backend.authenticate(_request(token))
+        for i in range(50):
+            await backend.authenticate(_request(f"junk.{i}.token"))
+        assert list(backend._cache) == hot
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("hot token re-verified")
+
+        monkeypatch.setattr(jwt, "decode", fail_decode)
+        for token in hot:
+            assert (await backend.authenticate(_request(token))).is_authenticated
+
+    async def test_cache_disabled(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET, cache_size=0)
+        assert (await backend.authenticate(_request(_token()))).is_authenticated
+        assert not backend._cache
+
+
+class TestAuthorizationParsing:
+    async def test_scheme_is_case_insensitive(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        user = await backend.authenticate(_request(_token(), scheme="bEaReR"))
+        assert user.is_authenticated
+
+    async def test_malformed_headers_are_anonymous(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        for header in ("Bearer", "Bearer ", "Bearerx abc", "Token abc", "Bear abc"):
+            assert not (await backend.authenticate(_raw_request(header))).is_authenticated
+
+    async def test_token_backend_passes_token_through(self) -> None:
+        seen: list[str] = []
+
+        async def verify(token: str):
+            seen.append(token)
+
+        backend = TokenAuthBackend(secret_key=SECRET, verify_token=verify, token_prefix="Token")
+        await backend.authenticate(_raw_request("token abc def"))
+        await backend.authenticate(_raw_request("Bearer nope"))
+        assert seen == ["abc def"]
+
+    async def test_basic_backend(self) -> None:
+        async def verify(username: str, password: str):
+            return User(id=username) if password == "p:w" else None
+
+        backend = BasicAuthBackend(verify_credentials=verify)
+        creds = base64.b64encode(b"thor:p:w").decode()
+        assert (await backend.authenticate(_raw_request(f"Basic {creds}"))).id == "thor"
+        assert not (await backend.authenticate(_raw_request(f"Bearer {creds}"))).is_authenticated
+
+    async def test_basic_backend_rejects_malformed_credentials(self) -> None:
+        async def verify(username: str, password: str):
+            return User(id=username)
+
+        backend = BasicAuthBackend(verify_credentials=verify)
+        for raw in (b"no-colon", b"\xff\xfe:pw"):
+            creds = base64.b64encode(raw).decode()
+            assert not (await backend.authenticate(_raw_request(f"Basic {creds}"))).is_authenticated
+        assert not (await backend.authenticate(_raw_request("Basic !!!notbase64"))).is_authenticated
+        unicode_creds = base64.b64encode("tyr:påss".encode()).decode()
+        assert (await backend.authenticate(_raw_request(f"Basic {unicode_creds}"))).id == "tyr"
+
+
+class TestUser:
+    def test_user_is_slotted(self) -> None:
+        user = User(id="1", scopes=["read"])
+        assert not hasattr(user, "__dict__")
+        assert user.has_scope("read")
+        with pytest.raises(AttributeError):
+            user.nickname = "thor"  # type: ignore[attr-defined]
+
+
+class TestAnonymousUser:
+    async def test_backends_share_one_immutable_instance(self) -> None:
+        backend = JWTAuthBackend(secret_key=SECRET)
+        first = await backend.authenticate(_raw_request("Token abc"))
+        second = await BasicAuthBackend().authenticate(_raw_request(""))
+        assert first is second
+        assert isinstance(first, AnonymousUser)
+        assert first.scopes == ()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.id = "x"  # type: ignore[misc]
+        with pytest.raises(TypeError):
+            first.data["x"] = 1  # type: ignore[index]
+
+
+class TestAuthMiddleware:
+    async def test_accepts_duck_typed_backend(self) -> None:
+        class HeaderBackend:  # satisfies the AuthBackend protocol structurally
+            async def authenticate(self, request):
+                return User(id=request.get_header("x-user") or "")
+
+        seen: list[str] = []
+
+        async def inner(scope, receive, send):
+            seen.append(scope["user"].id)
+
+        mw = AuthMiddleware(inner, backend=HeaderBackend())
+        await mw(make_scope(headers={"X-User": "odin"}), make_receive(), ResponseCapture())
+        assert seen == ["odin"]
+
+    async def test_excluded_prefix_skips_backend(self) -> None:
+        seen: list[str] = []
+
+        async def inner(scope, receive, send):
+            seen.append(scope["user"].is_authenticated)
+
+        mw = AuthMiddleware(
+            inner,
+            backend=JWTAuthBackend(secret_key=SECRET),
+            exclude_paths=["/public", "/health"],
+        )
+        token = _token()
+        headers = {"Authorization": f"Bearer {token}"}
+        await mw(make_scope(path="/health/live", headers=headers), make_receive(), ResponseCapture())
+        await mw(make_scope(path="/private", headers=headers), make_receive(), ResponseCapture())
+        assert seen == [False, True]
+
+    async def test_excluded_path_builds_no_request(self, monkeypatch) -> None:
+        import thor.auth
+
+        def no_request(*args, **kwargs):
+            raise AssertionError("Request constructed for an excluded path")
+
+        monkeypatch.setattr(thor.auth, "Request", no_request)
+        seen: list[object] = []
+
+        async def inner(scope, receive, send):
+            seen.append(scope["user"])
+
+        mw = AuthMiddleware(inner, backend=JWTAuthBackend(secret_key=SECRET), exclude_paths=["/health"])
+        await mw(make_scope(path="/health"), make_receive(), ResponseCapture())
+        assert seen == [AnonymousUser()]
+
+
+class TestDecorators:
+    def _request_for(self, user) -> Request:
+        scope = make_scope()
+        scope["user"] = user
+        return Request(scope, make_receive())
+
+    async def test_login_required_preserves_metadata(self) -> None:
+        async def handler(request):
+            """Docstring."""
+            return "ok"
+
+        wrapped = login_required(handler)
+        assert wrapped.__name__ == "handler"
+        assert wrapped.__doc__ == "Docstring."
+        assert wrapped.__wrapped__ is handler
+        assert await wrapped(self._request_for(User(id="1"))) == "ok"
+        with pytest.raises(Unauthorized):
+            await wrapped(self._request_for(AnonymousUser()))
+
+    async def test_require_scopes(self) -> None:
+        @require_scopes("read", "write")
+        async def handler(request):
+            return "ok"
+
+        assert handler.__name__ == "handler"
+        assert await handler(self._request_for(User(id="1", scopes=["write", "read", "x"]))) == "ok"
+        with pytest.raises(Forbidden, match="write"):
+            await handler(self._request_for(User(id="1", scopes=["read"])))
+        with pytest.raises(Unauthorized):
+            await handler(self._request_for(None))
@@ -1,8 +1,24 @@
 """Tests for thor.cookies — signing, unsigning, parsing."""
 
+import math
+
+import pytest
+
 from thor.cookies import CookieOptions, SecureCookie, format_set_cookie, parse_cookies
 
 
+@pytest.fixture(params=["orjson", "json"])
+def json_encoder(request, monkeypatch) -> str:
+    """Run a test once through orjson (when installed) and once through stdlib json."""
+    from thor import cookies as cookies_module
+
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(cookies_module, "orjson", None)
+    return request.param
+
+
 class TestSecureCookie:
     def test_sign_and_unsign(self) -> None:
         sc = SecureCookie("secret-key-for-tests")
@@ -20,7 +36,7 @@ class TestSecureCookie:
         # Manually craft an old timestamp
         old_ts = str(int(time.time()) - 1000)
         value_with_ts = f"{old_ts}:testval"
-        sig = sc._create_signature(value_with_ts)
+        sig = sc._create_signature(value_with_ts.encode()).decode()
         signed = f"{value_with_ts}:{sig}"
 
         # Should fail with max_age=1
@@ -28,6 +44,54 @@ class TestSecureCookie:
         # Should succeed without max_age
         assert sc.unsign(signed) == "testval"
 
+    def test_signature_is_versioned(self) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        signature = sc.sign("hello").rsplit(":", 1)[1]
+        assert signature.startswith("b2.")
+        # An unversioned signature over the same payload is rejected
+        assert sc.unsign(sc.sign("hello").replace(":b2.", ":")) is None
+
+    def test_different_keys_do_not_verify(self) -> None:
+        signed = SecureCookie("secret-key-for-tests").sign("hello")
+        assert SecureCookie("another-secret-key").unsign(signed) is None
+
+    def test_signature_is_fixed_width_and_padded(self) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        signature = sc.sign("hello").rsplit(":", 1)[1]
+        assert len(signature) == 47
+        assert signature.endswith("=")
+
+    def test_value_with_colons_round_trips(self) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        assert sc.unsign(sc.sign("a:b:c")) == "a:b:c"
+        assert sc.unsign(sc.sign("")) == ""
+
+    def test_sign_accepts_bytes(self) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        assert sc.unsign(sc.sign(b"raw")) == "raw"
+        assert sc.unsign(sc.sign("nött")) == "nött"
+
+    def test_decode_value_rejects_garbage(self) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        assert sc.decode_value(sc.sign("not base64 json")) is None
+        assert sc.decode_value("nön-ascii:x:y") is None
+
+    def test_long_secret_key(self) -> None:
+        sc = SecureCookie("k" * 200)
+        assert sc.unsign(sc.sign("hello")) == "hello"
+
+    def test_expired_value_skips_signature_check(self, monkeypatch) -> None:
+        import time
+
+        sc = SecureCookie("secret-key-for-tests")
+        signed = f"{int(time.time()) - 1000}:testval:b2.{'A' * 43}="
+
+        def fail(value):
+            raise AssertionError("MAC computed for an expired value")
+
+        monkeypatch.setattr(sc, "_create_signature", fail)
+        assert sc.unsign(signed, max_age=1) is None
+
     def test_encode_decode(self) -> None:
         sc = SecureCookie("secret-key-for-tests")
         data = {"user": "admin", "role": "superuser"}
@@ -35,6 +99,72 @@ class TestSecureCookie:
         decoded = sc.decode_value(encoded)
         assert decoded == data
 
+    def test_encode_decode_values_orjson_rejects(self) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        data = {1: "int key", "big": 2**70, "text": "ünïcode"}
+        assert sc.decode_value(sc.encode_value(data)) == {"1": "int key", "big": 2**70, "text": "ünïcode"}
+
+    def test_encode_decode_integer_beyond_64_bits(self, json_encoder: str) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        assert sc.decode_value(sc.encode_value({"big": 2**70 + 1})) == {"big": 2**70 + 1}
+
+    def test_encode_decode_non_finite_float(self, json_encoder: str) -> None:
+        sc = SecureCookie("secret-key-for-tests")
+        decoded = sc.decode_value(sc.encode_value({"a": float("nan"), "b": None}))
+        assert math.isnan(decoded["a"])
+        assert decoded["b"] is None
+
+    def test_encode_rejects_datetime(self, json_encoder: str) -> None:
+        from datetime import datetime
+
+        with pytest.raises(TypeError):
+            SecureCookie("secret-key-for-tests").encode_value({"t": datetime(2024, 1, 1)})
+
+    @staticmethod
+    def _legacy_sign(secret: str, value: str, timestamp: int) -> str:
+        """Sign *value* the way SecureCookie did before versioned signatures."""
+        import base64
+        import hashlib
+        import hmac
+
+        value_with_ts = f"{timestamp}:{value}"
+        digest = hmac.new(secret.encode(), value_with_ts.encode(), hashlib.sha256).digest()
+        return f"{value_with_ts}:{base64.urlsafe_b64encode(digest).decode().rstrip('=')}"
+
+    def test_legacy_hmac_signature_accepted(self) -> None:
+        import time
+
+        sc = SecureCookie("secret-key-for-tests")
+        signed = self._legacy_sign("secret-key-for-tests", "hello", int(time.time()))
+        assert sc.unsign(signed, max_age=60) == "hello"
+
+    def test_legacy_encoded_value_accepted(self) -> None:
+        import base64
+        import time
+
+        sc = SecureCookie("secret-key-for-tests")
+        payload = base64.urlsafe_b64encode(b'{"user":"admin"}').decode()
+        signed = self._legacy_sign("secret-key-for-tests", payload, int(time.time()))
+        assert sc.decode_value(signed) == {"user": "admin"}
+
+    def test_legacy_signature_with_wrong_key_rejected(self) -> None:
+        import time
+
+        sc = SecureCookie("secret-key-for-tests")
+        signed = self._legacy_sign("another-secret-entirely", "hello", int(time.time()))
+        assert sc.unsign(signed) is None
+
+    def test_legacy_signature_still_expires(self) -> None:
+        import time
+
+        sc = SecureCookie("secret-key-for-tests")
+        signed = self._legacy_sign("secret-key-for-tests", "hello", int(time.time()) - 3600)
+        assert sc.unsign(signed, max_age=60) is None
+
+    def test_signs_with_versioned_signature(self) -> None:
+        signed = SecureCookie("secret-key-for-tests").sign("hello")
+        assert signed.rpartition(":")[2].startswith("b2.")
+
     def test_generate_secret_key(self) -> None:
         key = SecureCookie.generate_secret_key()
         assert len(key) >= 32
@@ -48,6 +178,10 @@ class TestParseCookies:
     def test_empty(self) -> None:
         assert parse_cookies("") == {}
 
+    def test_whitespace_and_malformed_items(self) -> None:
+        header = " a = 1 ;flag;\tb=x=y ; ;c="
+        assert parse_cookies(header) == {"a": "1", "b": "x=y", "c": ""}
+
 
 class TestFormatSetCookie:
     def test_defaults(self) -> None:
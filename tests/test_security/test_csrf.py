@@ -60,6 +60,56 @@ class TestCSRFMiddleware:
         await mw(scope, make_receive(b""), cap)
         assert cap.status == 403
 
+    def test_non_ascii_token_never_matches(self) -> None:
+        assert CSRFMiddleware._tokens_match("abc", "abc")
+        assert not CSRFMiddleware._tokens_match("tökén", "tökén")
+        assert not CSRFMiddleware._tokens_match("abc", "äbc")
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b"_csrf_token=tok%2Fen&name=x",
+            b"name=x&_csrf_token=tok%2Fen",
+            b"name=x&x_csrf_token=no&_csrf_token=tok%2Fen&_csrf_token=other",
+        ],
+    )
+    async def test_form_field_token(self, body: bytes) -> None:
+        seen = {}
+
+        async def app(scope, receive, send):
+            from thor.request import Request
+
+            seen["form"] = await Request(scope, receive).form()
+            await _ok_app(scope, receive, send)
+
+        mw = CSRFMiddleware(app, secret_key=SECRET)
+        scope = make_scope(
+            method="POST",
+            path="/submit",
+            headers={
+                "cookie": "thor_csrf=tok/en",
+                "content-type": "application/x-www-form-urlencoded",
+            },
+        )
+        cap = ResponseCapture()
+        await mw(scope, make_receive(body), cap)
+        assert cap.status == 200
+        assert seen["form"]["name"] == "x"
+
+    async def test_custom_form_field_missing(self) -> None:
+        mw = CSRFMiddleware(_ok_app, secret_key=SECRET, form_field="token")
+        scope = make_scope(
+            method="POST",
+            path="/submit",
+            headers={
+                "cookie": "thor_csrf=abc",
+                "content-type": "application/x-www-form-urlencoded",
+            },
+        )
+        cap = ResponseCapture()
+        await mw(scope, make_receive(b"_csrf_token=abc&xtoken=abc"), cap)
+        assert cap.status == 403
+
     async def test_exclude_paths(self) -> None:
         mw = CSRFMiddleware(
             _ok_app,
@@ -71,6 +121,17 @@ class TestCSRFMiddleware:
         await mw(scope, make_receive(b""), cap)
         assert cap.status == 200
 
+    async def test_exclude_paths_any_prefix(self) -> None:
+        mw = CSRFMiddleware(
+            _ok_app,
+            secret_key=SECRET,
+            exclude_paths=["/hooks/", "/api/public"],
+        )
+        for path, status in [("/api/public/x", 200), ("/hooks/gh", 200), ("/api/private", 403)]:
+            cap = ResponseCapture()
+            await mw(make_scope(method="POST", path=path), make_receive(b""), cap)
+            assert cap.status == status
+
     async def test_csrf_cookie_set_on_response(self) -> None:
         mw = CSRFMiddleware(_ok_app, secret_key=SECRET)
         scope = make_scope(method="GET", path="/page")
@@ -38,6 +38,30 @@ class TestSession:
         s["x"] = 1
         assert s.is_modified
 
+    def test_update_marks_modified_once(self) -> None:
+        s = Session(SessionData())
+        s.update({})
+        assert not s.is_modified
+        s.update({"a": 1}, b=2)
+        assert dict(s) == {"a": 1, "b": 2}
+        assert s.is_modified
+
+    def test_ior_updates_in_place(self) -> None:
+        s = Session(SessionData())
+        same = s
+        s |= {"c": 3}
+        assert s is same
+        assert s["c"] == 3
+        assert s.is_modified
+
+    def test_as_mapping_is_read_only_view(self) -> None:
+        s = Session(SessionData(data={"a": 1}))
+        view = s.as_mapping()
+        s["b"] = 2
+        assert view == {"a": 1, "b": 2}
+        with pytest.raises(TypeError):
+            view["c"] = 3  # type: ignore[index]
+
     def test_flash(self) -> None:
         sd = SessionData()
         s = Session(sd)